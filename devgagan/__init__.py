@@ -12,6 +12,7 @@
 # ---------------------------------------------------
 
 import asyncio
+import gc
 import logging
 import time
 import sys
@@ -22,10 +23,6 @@ from telethon import TelegramClient
 from telethon.errors.rpcerrorlist import FloodWaitError
 from motor.motor_asyncio import AsyncIOMotorClient
 
-# Create and set a fresh event loop (original code did this)
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-
 logging.basicConfig(
     format="[%(levelname) 5s/%(asctime)s] %(name)s: %(message)s",
     level=logging.INFO,
@@ -33,34 +30,54 @@ logging.basicConfig(
 
 botStartTime = time.time()
 
-# Pyrogram bot client (kept as before)
-app = Client(
-    "pyrobot",
-    api_id=API_ID,
-    api_hash=API_HASH,
-    bot_token=BOT_TOKEN,
-    workers=50,
-    parse_mode=ParseMode.MARKDOWN
-)
+# Optional C crypto backends; both clients pick them up automatically
+try:
+    import cryptg  # noqa: F401
+except ImportError:
+    logging.warning("cryptg not installed; Telethon will use slow pure-Python AES-IGE")
+try:
+    import tgcrypto  # noqa: F401
+except ImportError:
+    logging.warning("tgcrypto not installed; Pyrogram will use slow pure-Python AES-IGE")
 
-# We'll create Telethon clients but start them safely inside restrict_bot()
+# Clients are created inside restrict_bot() so they bind to the running loop
+# (importing the package no longer creates a loop or touches the network).
+app = None
+pro = None
+userrbot = None
 sex = None
 telethon_client = None
 
-# Pro client (pyrogram) when STRING is provided
-if STRING:
-    pro = Client("ggbot", api_id=API_ID, api_hash=API_HASH, session_string=STRING)
-else:
-    pro = None
+# Pyrogram client specs: (session name, Client kwargs). Optional clients are
+# only listed when their session string is configured.
+_client_specs = [
+    # Pyrogram bot client (kept as before)
+    ("pyrobot", dict(api_id=API_ID, api_hash=API_HASH, bot_token=BOT_TOKEN, workers=50, parse_mode=ParseMode.MARKDOWN)),
+    # Pro client (pyrogram) when STRING is provided
+    ("ggbot", dict(api_id=API_ID, api_hash=API_HASH, session_string=STRING)) if STRING else None,
+    # Optional userrbot (pyrogram) if DEFAULT_SESSION is provided
+    ("userrbot", dict(api_id=API_ID, api_hash=API_HASH, session_string=DEFAULT_SESSION)) if DEFAULT_SESSION else None,
+]
+_client_specs = [spec for spec in _client_specs if spec]
 
-# Optional userrbot (pyrogram) if DEFAULT_SESSION is provided
-if DEFAULT_SESSION:
-    userrbot = Client("userrbot", api_id=API_ID, api_hash=API_HASH, session_string=DEFAULT_SESSION)
-else:
-    userrbot = None
+def _build_clients():
+    """Create the Pyrogram clients from _client_specs; must run inside the event loop."""
+    global app, pro, userrbot
+    clients = {name: Client(name, **kwargs) for name, kwargs in _client_specs}
+    app = clients["pyrobot"]
+    pro = clients.get("ggbot")
+    userrbot = clients.get("userrbot")
+    return clients
 
 # MongoDB setup (async motor)
-tclient = AsyncIOMotorClient(MONGO_DB)
+tclient = AsyncIOMotorClient(
+    MONGO_DB,
+    minPoolSize=10,  # keep sockets warm so the first queries skip TCP/TLS/auth
+    maxPoolSize=50,
+    serverSelectionTimeoutMS=5000,
+    connectTimeoutMS=5000,
+    retryWrites=True,
+)
 tdb = tclient["telegram_bot"]  # database
 token = tdb["tokens"]  # tokens collection
 
@@ -74,6 +91,11 @@ async def create_ttl_index():
 
 # Run the TTL index creation when the bot starts
 async def setup_database():
+    try:
+        # Eagerly open the pool before the bot starts taking traffic
+        await tclient.admin.command("ping")
+    except Exception as e:
+        print(f"[DB] MongoDB ping failed: {e}")
     await create_ttl_index()
 
 async def safe_start_telethon(session_name: str, bot_token: str):
@@ -104,61 +126,119 @@ async def safe_start_telethon(session_name: str, bot_token: str):
         except Exception:
             pass
         return None
+    except asyncio.CancelledError:
+        # startup aborted by a fatal sibling: don't leave a half-open connection
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
+        raise
+
+async def _start_app(client):
+    """Start the Pyrogram bot and fetch its identity (kept sequential)."""
+    await client.start()
+    return await client.get_me()
+
+async def _start_optional(client):
+    """
+    Start an optional Pyrogram client. A failure is returned instead of raised
+    so it doesn't cancel the rest of startup.
+    """
+    try:
+        await client.start()
+        return client
+    except asyncio.CancelledError:
+        try:
+            await client.stop()
+        except Exception:
+            pass
+        raise
+    except Exception as e:
+        return e
+
+async def _stop_started(clients, tasks):
+    """After a failed startup, shut down every client whose start had completed."""
+    for name, task in tasks.items():
+        if not task.done() or task.cancelled() or task.exception() is not None:
+            continue
+        res = task.result()
+        try:
+            if isinstance(res, TelegramClient):
+                await res.disconnect()
+            elif name in clients and not isinstance(res, BaseException):
+                await clients[name].stop()
+        except Exception:
+            pass
 
 async def restrict_bot():
     """
     Main startup: DB setup, start pyrogram app and optional clients,
     then start Telethon clients safely.
+    All clients connect concurrently inside a TaskGroup. Optional clients and
+    Telethon (FloodWait) failures are tolerated; if the bot itself fails the
+    remaining starts are cancelled and cleaned up.
     """
     global sex, telethon_client, pro, userrbot
 
-    # Setup DB indices
-    await setup_database()
-
-    # Start Pyrogram bot (app) and fetch bot info
+    clients = _build_clients()
     try:
-        await app.start()
-        getme = await app.get_me()
-        BOT_ID = getme.id
-        BOT_USERNAME = getme.username
-        BOT_NAME = f"{getme.first_name} {getme.last_name}" if getattr(getme, "last_name", None) else getme.first_name
-        print(f"[INFO] Pyrogram bot started: @{BOT_USERNAME} ({BOT_ID})")
-    except Exception as e:
-        print(f"[FATAL] Failed to start Pyrogram bot: {type(e).__name__}: {e}")
-        # If Pyrogram fails to start, still try to start other parts if appropriate
+        async with asyncio.TaskGroup() as tg:
+            t_db = tg.create_task(setup_database())
+            t_sex = tg.create_task(safe_start_telethon("sexrepo", BOT_TOKEN))
+            t_telethon = tg.create_task(safe_start_telethon("telethon_session", BOT_TOKEN))
+            t_app = tg.create_task(_start_app(clients["pyrobot"]))
+            t_optional = {
+                name: tg.create_task(_start_optional(client))
+                for name, client in clients.items() if name != "pyrobot"
+            }
+    except ExceptionGroup:
+        tasks = {"database": t_db, "sexrepo": t_sex, "telethon_session": t_telethon,
+                 "pyrobot": t_app, **t_optional}
+        for name, task in tasks.items():
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                e = task.exception()
+                print(f"[FATAL] Failed to start {name}: {type(e).__name__}: {e}")
+        await _stop_started(clients, tasks)
+        try:
+            # a bot start that failed half-way can still hold a connection
+            if app.is_connected:
+                await app.stop()
+        except Exception:
+            pass
         # Optionally sys.exit(1) if you want to fail hard:
         # sys.exit(1)
+        return
 
-    # Start pro (pyrogram) if provided
+    app_res = t_app.result()
+    pro_res = t_optional["ggbot"].result() if "ggbot" in t_optional else None
+    userrbot_res = t_optional["userrbot"].result() if "userrbot" in t_optional else None
+    sex_res = t_sex.result()
+    telethon_res = t_telethon.result()
+
+    # Pyrogram bot (app) and bot info
+    getme = app_res
+    BOT_ID = getme.id
+    BOT_USERNAME = getme.username
+    BOT_NAME = f"{getme.first_name} {getme.last_name}" if getattr(getme, "last_name", None) else getme.first_name
+    print(f"[INFO] Pyrogram bot started: @{BOT_USERNAME} ({BOT_ID})")
+
+    # pro (pyrogram) if provided
     if pro:
-        try:
-            await pro.start()
+        if isinstance(pro_res, BaseException):
+            print(f"[WARN] Could not start pro client: {pro_res}")
+        else:
             print("[INFO] Pro Pyrogram client started.")
-        except Exception as e:
-            print(f"[WARN] Could not start pro client: {e}")
 
-    # Start userrbot (pyrogram) if provided
+    # userrbot (pyrogram) if provided
     if userrbot:
-        try:
-            await userrbot.start()
+        if isinstance(userrbot_res, BaseException):
+            print(f"[WARN] Could not start userrbot: {userrbot_res}")
+        else:
             print("[INFO] Userrbot (pyrogram) started.")
-        except Exception as e:
-            print(f"[WARN] Could not start userrbot: {e}")
 
-    # Start Telethon clients safely (these may hit FloodWait)
-    # sex client (session name 'sexrepo')
-    try:
-        sex = await safe_start_telethon("sexrepo", BOT_TOKEN)
-    except Exception as e:
-        print(f"[WARN] Unexpected error when starting sex Telethon client: {e}")
-        sex = None
-
-    # telethon_client (session name 'telethon_session')
-    try:
-        telethon_client = await safe_start_telethon("telethon_session", BOT_TOKEN)
-    except Exception as e:
-        print(f"[WARN] Unexpected error when starting telethon_client: {e}")
-        telethon_client = None
+    # Telethon clients (safe_start_telethon already absorbs FloodWait)
+    sex = sex_res
+    telethon_client = telethon_res
 
     # Final status
     print("Startup summary:")
@@ -168,10 +248,27 @@ async def restrict_bot():
     print(f"  • Telethon sex: {'✅' if sex else '❌'}")
     print(f"  • Telethon telethon_client: {'✅' if telethon_client else '❌'}")
 
-# Run the startup procedure
-try:
-    loop.run_until_complete(restrict_bot())
-except Exception as e:
-    print(f"[FATAL] Error during startup: {e}")
-    # Do not re-raise to avoid orchestrator crash loop; exit only if necessary.
-    # sys.exit(1)
+async def _boot(entry=None):
+    try:
+        await restrict_bot()
+    except Exception as e:
+        print(f"[FATAL] Error during startup: {e}")
+        # Do not re-raise to avoid orchestrator crash loop; exit only if necessary.
+        # sys.exit(1)
+    if entry is not None:
+        await entry()
+
+def main(entry=None):
+    """
+    Entry point: install uvloop when available, then run startup followed by
+    the optional `entry` coroutine function on a single event loop.
+    """
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    # downloads free their buffers by refcount; a high gen-0 threshold keeps
+    # the collector from scanning the heap on every burst of small objects
+    gc.set_threshold(50000, 10, 10)
+    asyncio.run(_boot(entry))
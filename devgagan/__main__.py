@@ -16,14 +16,13 @@ import asyncio
 import importlib
 import gc
 from pyrogram import idle
+from devgagan import main
 from devgagan.modules import ALL_MODULES
 from devgagan.core.mongo.plans_db import check_and_remove_expired_users
 from aiojobs import create_scheduler
 
 # ----------------------------Bot-Start---------------------------- #
 
-loop = asyncio.get_event_loop()
-
 # Function to schedule expiry checks
 async def schedule_expiry_check():
     scheduler = await create_scheduler()
@@ -58,6 +57,6 @@ async def devggn_boot():
 
 
 if __name__ == "__main__":
-    loop.run_until_complete(devggn_boot())
+    main(devggn_boot)
 
 # ------------------------------------------------------------------ #
@@ -12,8 +12,9 @@ import re
 import os
 import asyncio
 import subprocess
-from datetime import datetime as dt
+from asyncio.subprocess import DEVNULL
 from typing import Optional
+from cachetools import LRUCache
 
 import cv2
 
@@ -31,14 +32,49 @@ from config import CHANNEL_ID, OWNER_ID
 from devgagan.core.mongo.plans_db import premium_users
 
 # ---------- Utilities ----------
+PREMIUM_CACHE_TTL = 30  # seconds
+
+_OWNER_IDS = frozenset(OWNER_ID)
+_premium_cache = {"set": None, "exp": 0.0}
+_premium_lock = asyncio.Lock()
+
+def invalidate_premium_cache():
+    """Force the next chk_user() to reload premium users from the DB."""
+    _premium_cache["exp"] = 0.0
+
+async def _premium_set():
+    if time.monotonic() < _premium_cache["exp"]:
+        return _premium_cache["set"]
+    async with _premium_lock:
+        # another coroutine may have refreshed while we waited
+        if time.monotonic() < _premium_cache["exp"]:
+            return _premium_cache["set"]
+        users = set(await premium_users())
+        _premium_cache["set"] = users
+        _premium_cache["exp"] = time.monotonic() + PREMIUM_CACHE_TTL
+        return users
+
+def chk_user_sync(user_id: int) -> Optional[int]:
+    """
+    Answer chk_user() without awaiting: 0/1 for owners or while the premium
+    cache is fresh, None when the DB has to be consulted.
+    """
+    if user_id in _OWNER_IDS:
+        return 0
+    if time.monotonic() < _premium_cache["exp"]:
+        return 0 if user_id in _premium_cache["set"] else 1
+    return None
 
 async def chk_user(message, user_id: int):
     """
     Return 0 for premium/owner, 1 for free users (same behavior as original).
+    Premium users are cached for PREMIUM_CACHE_TTL seconds.
     """
+    cached = chk_user_sync(user_id)
+    if cached is not None:
+        return cached
     try:
-        user = await premium_users()
-        if user_id in user or user_id in OWNER_ID:
+        if user_id in await _premium_set():
             return 0
         else:
             return 1
@@ -81,46 +117,57 @@ async def gen_link(client, chat_id):
         print(f"[gen_link] {e}")
         return None
 
+MEMBER_CACHE_TTL = 300  # seconds a confirmed channel membership is trusted
+
+# user_id -> (checked_at, is_member)
+_member_cache: dict = {}
+
+async def _is_member(client, channel, user_id) -> bool:
+    try:
+        # Telethon get_participant/get_permissions usage may vary; try get_participant
+        await client.get_participant(channel, user_id)
+        return True
+    except UserNotParticipant:
+        return False
+    except Exception:
+        # Some wrappers raise different exceptions — fallback to trying to fetch chat member via functions
+        try:
+            await client(functions.channels.GetParticipantRequest(channel=channel, participant=user_id))
+            return True
+        except Exception:
+            return False
+
 async def subscribe(client, message):
     """
     Ensure user subscribed to CHANNEL_ID. If not, send an invite/link prompt.
     client: Telethon client (to export invite)
     message: Telethon Message object (caller)
+    Confirmed members are cached for MEMBER_CACHE_TTL seconds.
     """
     update_channel = CHANNEL_ID
-    try:
-        url = await gen_link(client, update_channel)
-    except Exception:
-        url = None
-
     if not update_channel:
         return None
 
     try:
-        # Try to see if the user is participant
-        try:
-            # Telethon get_participant/get_permissions usage may vary; try get_participant
-            # get_participant accepts (channel, user) where user may be id or username
-            user_id = None
-            try:
-                # event-like message may have .from_id.user_id or .sender_id
-                user_id = message.from_id.user_id if getattr(message, 'from_id', None) and getattr(message.from_id, 'user_id', None) else getattr(message, 'sender_id', None)
-            except Exception:
-                user_id = getattr(message, 'sender_id', None)
+        # event-like message may have .sender_id or .from_id.user_id
+        from_id = getattr(message, 'from_id', None)
+        user_id = getattr(message, 'sender_id', None) or getattr(from_id, 'user_id', None)
 
-            if user_id is not None:
-                participant = await client.get_participant(update_channel, user_id)
+        if user_id is not None:
+            hit = _member_cache.get(user_id)
+            if hit and time.monotonic() - hit[0] < MEMBER_CACHE_TTL and hit[1]:
                 return 0
-        except UserNotParticipant:
-            # not participant
-            pass
-        except Exception:
-            # Some wrappers raise different exceptions — fallback to trying to fetch chat member via functions
-            try:
-                await client(functions.channels.GetParticipantRequest(channel=update_channel, participant=getattr(message, 'sender_id', None)))
+            is_member = await _is_member(client, update_channel, user_id)
+            # only memberships are cached so a user who just joined isn't kept waiting
+            if is_member:
+                _member_cache[user_id] = (time.monotonic(), True)
                 return 0
-            except Exception:
-                pass
+            _member_cache.pop(user_id, None)
+
+        try:
+            url = await gen_link(client, update_channel)
+        except Exception:
+            url = None
 
         # If here, assume user not participant
         caption = "Join our channel to use the bot"
@@ -147,37 +194,142 @@ async def subscribe(client, message):
         return 1
 
 # --------- Time helpers ----------
-async def get_seconds(time_string: str) -> int:
+_TIME_RE = re.compile(r"(\d+)\s*([a-zA-Z]+)")
+_UNIT_MULT = {
+    "s": 1,
+    "min": 60,
+    "hour": 3600,
+    "day": 86400,
+    "month": 86400 * 30,
+    "year": 86400 * 365,
+}
+
+def get_seconds(time_string: str) -> int:
     """
     Parse strings like '5min', '2hour', '10s' etc. and return seconds.
     """
-    def extract_value_and_unit(ts):
-        value = ""
-        unit = ""
-        index = 0
-        while index < len(ts) and ts[index].isdigit():
-            value += ts[index]
-            index += 1
-        unit = ts[index:].lstrip()
-        if value:
-            value = int(value)
-        return value, unit
-
-    value, unit = extract_value_and_unit(time_string)
-    if unit == 's':
-        return value
-    elif unit == 'min':
-        return value * 60
-    elif unit == 'hour':
-        return value * 3600
-    elif unit == 'day':
-        return value * 86400
-    elif unit == 'month':
-        return value * 86400 * 30
-    elif unit == 'year':
-        return value * 86400 * 365
-    else:
-        return 0
+    m = _TIME_RE.fullmatch(time_string)
+    return int(m.group(1)) * _UNIT_MULT.get(m.group(2), 0) if m else 0
+
+# ---------- Rate limiting ----------
+class TokenBucket:
+    """
+    Adaptive token bucket for Telegram edit/send RPCs.
+    The refill rate grows by `sigma` tokens/s after every successful call and
+    is multiplied by `beta` on FloodWait, so it settles near the quota the
+    server actually grants. Burst capacity is `alpha` seconds worth of tokens.
+    """
+
+    def __init__(self, rate: float = 1.0, alpha: float = 2.0, beta: float = 0.5, sigma: float = 0.2,
+                 min_rate: float = 0.05, max_rate: float = 20.0):
+        self.rate = rate
+        self.alpha = alpha
+        self.beta = beta
+        self.sigma = sigma
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.capacity = max(1.0, alpha * rate)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        return now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now; never waits."""
+        now = self._refill()
+        if now < self.blocked_until or self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    async def acquire(self):
+        """Wait until a token is available, then take it."""
+        while True:
+            now = self._refill()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def increase(self):
+        self.rate = min(self.max_rate, self.rate + self.sigma)
+        self.capacity = max(1.0, self.alpha * self.rate)
+
+    def decrease(self, seconds: float = 0):
+        self.rate = max(self.min_rate, self.rate * self.beta)
+        self.capacity = max(1.0, self.alpha * self.rate)
+        self.tokens = min(self.tokens, self.capacity)
+        if seconds:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+# Telegram's edit limits are per chat, so each chat gets its own bucket and
+# one busy user can't starve everyone else's edits
+_edit_buckets = LRUCache(maxsize=4096)
+
+def _chat_key(message):
+    chat_id = getattr(message, "chat_id", None)
+    if chat_id is None:
+        chat_id = getattr(getattr(message, "chat", None), "id", None)
+    return chat_id
+
+def _edit_bucket(message) -> TokenBucket:
+    key = _chat_key(message)
+    bucket = _edit_buckets.get(key)
+    if bucket is None:
+        bucket = _edit_buckets[key] = TokenBucket()
+    return bucket
+
+def _flood_wait_seconds(e) -> Optional[float]:
+    """Seconds to wait for a Telethon or Pyrogram FloodWait error, else None."""
+    if isinstance(e, FloodWaitError) or type(e).__name__ == "FloodWait":
+        return getattr(e, "seconds", None) or getattr(e, "value", None) or 0
+    return None
+
+def _edit_fn(message):
+    """Resolve (and remember on the message) its Telethon/Pyrogram edit method."""
+    fn = getattr(message, "edit", None) or getattr(message, "edit_text", None)
+    try:
+        message._edit_fn = fn
+    except Exception:
+        pass
+    return fn
+
+async def safe_edit(message, text, wait: bool = True) -> bool:
+    """
+    Edit `message` through its chat's token bucket.
+    With wait=False (progress callbacks) the edit is dropped instead of
+    delaying the transfer when no token is free or Telegram asks to wait;
+    progress callbacks still wait for the final 100% edit so it is never lost.
+    Returns True if the edit went through.
+    """
+    bucket = _edit_bucket(message)
+    if wait:
+        await bucket.acquire()
+    elif not bucket.try_acquire():
+        return False
+    fn = getattr(message, "_edit_fn", None) or _edit_fn(message)
+    if fn is None:
+        return False
+    try:
+        await fn(text)
+        bucket.increase()
+        return True
+    except Exception as e:
+        seconds = _flood_wait_seconds(e)
+        if seconds is None:
+            return False
+        bucket.decrease(seconds)
+        if wait:
+            await asyncio.sleep(seconds)
+        return False
 
 # ---------- Progress helpers ----------
 PROGRESS_BAR = """\n
@@ -188,68 +340,76 @@ PROGRESS_BAR = """\n
 ╰─────────────────────╯
 """
 
+# the 11 possible bars (0%..100% in steps of 10)
+_BARS = tuple("♦" * i + "◇" * (10 - i) for i in range(11))
+
+PROGRESS_INTERVAL = 5  # minimum seconds between two edits of the same message
+
+def _progress_due(message, current, total) -> bool:
+    """Per-message throttle: True when `message` may be edited again."""
+    now = time.monotonic()
+    if current != total and now - getattr(message, "_progress_last", 0.0) < PROGRESS_INTERVAL:
+        return False
+    try:
+        message._progress_last = now
+    except Exception:
+        pass
+    return True
+
+def _render_progress(current, total, start) -> str:
+    """Build the progress bar text shared by progress_bar and prog_bar."""
+    diff = time.time() - start
+    if diff <= 0:
+        diff = 0.1
+    percentage = (current * 100) / total if total else 0
+    speed = current / diff if diff else 0
+    elapsed_time = round(diff) * 1000
+    time_to_completion = round((total - current) / speed) * 1000 if speed else 0
+    estimated_total_time_str = TimeFormatter(milliseconds=elapsed_time + time_to_completion)
+    return _BARS[min(10, max(0, int(percentage // 10)))] + PROGRESS_BAR.format(
+        round(percentage, 2),
+        humanbytes(current),
+        humanbytes(total),
+        humanbytes(speed),
+        estimated_total_time_str if estimated_total_time_str != '' else "0 s"
+    )
+
 async def progress_bar(current, total, ud_type, message, start):
     """
     Similar behavior to original: periodically edit 'message' with progress.
     message: Telethon Message (has .edit method)
     """
     try:
-        now = time.time()
-        diff = now - start
         # update only intermittently to avoid flooding
-        if diff <= 0:
-            diff = 0.1
-        if round(diff % 10.00) == 0 or current == total:
-            percentage = (current * 100) / total if total else 0
-            speed = current / diff if diff else 0
-            elapsed_time = round(diff) * 1000
-            time_to_completion = round((total - current) / speed) * 1000 if speed else 0
-            estimated_total_time = elapsed_time + time_to_completion
-            elapsed_time_str = TimeFormatter(milliseconds=elapsed_time)
-            estimated_total_time_str = TimeFormatter(milliseconds=estimated_total_time)
-            progress = "{0}{1}".format(
-                ''.join(["♦" for i in range(math.floor(percentage / 10))]),
-                ''.join(["◇" for i in range(10 - math.floor(percentage / 10))]))
-            tmp = progress + PROGRESS_BAR.format(
-                round(percentage, 2),
-                humanbytes(current),
-                humanbytes(total),
-                humanbytes(speed),
-                estimated_total_time_str if estimated_total_time_str != '' else "0 s"
-            )
-            try:
-                # Telethon Message.edit(text=...) or .edit may be supported
-                if hasattr(message, "edit"):
-                    await message.edit(f"{ud_type}\n│ {tmp}")
-                elif hasattr(message, "edit_text"):
-                    await message.edit_text(f"{ud_type}\n│ {tmp}")
-            except Exception:
-                pass
+        if not _progress_due(message, current, total):
+            return
+        await safe_edit(message, f"{ud_type}\n│ {_render_progress(current, total, start)}", wait=current == total)
     except Exception as e:
         print(f"[progress_bar] {e}")
 
 def humanbytes(size):
     if not size:
         return ""
-    power = 2**10
-    n = 0
-    Dic_powerN = {0: ' ', 1: 'K', 2: 'M', 3: 'G', 4: 'T'}
-    while size > power:
-        size /= power
-        n += 1
-    return str(round(size, 2)) + " " + Dic_powerN[n] + 'B'
+    n = min(4, int(math.log(max(size, 1), 1024)))
+    return f"{size / (1024 ** n):.2f} {' KMGT'[n]}B"
 
 def TimeFormatter(milliseconds: int) -> str:
     seconds, milliseconds = divmod(int(milliseconds), 1000)
     minutes, seconds = divmod(seconds, 60)
     hours, minutes = divmod(minutes, 60)
     days, hours = divmod(hours, 24)
-    tmp = ((str(days) + "d, ") if days else "") + \
-        ((str(hours) + "h, ") if hours else "") + \
-        ((str(minutes) + "m, ") if minutes else "") + \
-        ((str(seconds) + "s, ") if seconds else "") + \
-        ((str(milliseconds) + "ms, ") if milliseconds else "")
-    return tmp[:-2]
+    parts = []
+    if days:
+        parts.append(f"{days}d")
+    if hours:
+        parts.append(f"{hours}h")
+    if minutes:
+        parts.append(f"{minutes}m")
+    if seconds:
+        parts.append(f"{seconds}s")
+    if milliseconds:
+        parts.append(f"{milliseconds}ms")
+    return ", ".join(parts)
 
 def convert(seconds: int) -> str:
     seconds = seconds % (24 * 3600)
@@ -310,20 +470,19 @@ async def userbot_join(client, invite_link: str) -> str:
         return "Could not join, try joining manually."
 
 # ---------- URL helper ----------
+_URL_RE = re.compile(r"(?i)\b((?:https?://|www\d{0,3}[.]|[a-z0-9.\-]+[.][a-z]{2,4}/)(?:[^\s()<>]+|\(([^\s()<>]+|(\([^\s()<>]+\)))*\))+(?:\(([^\s()<>]+|(\([^\s()<>]+\)))*\)|[^\s`!()\[\]{};:'\".,<>?«»“”‘’]))")
+
 def get_link(string: str):
     """
     Extract first URL from string (same regex as original).
     """
-    regex = r"(?i)\b((?:https?://|www\d{0,3}[.]|[a-z0-9.\-]+[.][a-z]{2,4}/)(?:[^\s()<>]+|\(([^\s()<>]+|(\([^\s()<>]+\)))*\))+(?:\(([^\s()<>]+|(\([^\s()<>]+\)))*\)|[^\s`!()\[\]{};:'\".,<>?«»“”‘’]))"
-    url = re.findall(regex, string)
-    try:
-        link = [x[0] for x in url][0]
-        if link:
-            return link
-        else:
-            return False
-    except Exception:
+    if not string:
         return False
+    # every URL form the regex accepts contains a "/" or "www"; skip it otherwise
+    if "/" not in string and "www" not in string.lower():
+        return False
+    m = _URL_RE.search(string)
+    return m.group(1) if m else False
 
 # ---------- Video metadata & screenshot ----------
 def video_metadata(file: str):
@@ -332,14 +491,17 @@ def video_metadata(file: str):
     """
     default_values = {'width': 1, 'height': 1, 'duration': 1}
     try:
-        vcap = cv2.VideoCapture(file)
-        if not vcap.isOpened():
-            return default_values
-        width = round(vcap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = round(vcap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fps = vcap.get(cv2.CAP_PROP_FPS)
-        frame_count = vcap.get(cv2.CAP_PROP_FRAME_COUNT)
-        vcap.release()
+        # force the FFmpeg backend instead of probing every installed one
+        vcap = cv2.VideoCapture(file, cv2.CAP_FFMPEG)
+        try:
+            if not vcap.isOpened():
+                return default_values
+            width = round(vcap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = round(vcap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = vcap.get(cv2.CAP_PROP_FPS)
+            frame_count = vcap.get(cv2.CAP_PROP_FRAME_COUNT)
+        finally:
+            vcap.release()
         if not fps or fps <= 0:
             return default_values
         duration = round(frame_count / fps)
@@ -350,6 +512,29 @@ def video_metadata(file: str):
         print(f"Error in video_metadata: {e}")
         return default_values
 
+# (path, mtime_ns, size) -> metadata; a rewritten file gets a new key
+_META_CACHE: dict = {}
+META_CACHE_SIZE = 256
+
+async def video_metadata_async(file: str):
+    """
+    Same as video_metadata but probes the file in a worker thread so the
+    event loop keeps serving other handlers meanwhile. Results are cached
+    per (path, mtime, size).
+    """
+    try:
+        st = os.stat(file)
+    except OSError:
+        return await asyncio.to_thread(video_metadata, file)
+    key = (file, st.st_mtime_ns, st.st_size)
+    meta = _META_CACHE.get(key)
+    if meta is None:
+        meta = await asyncio.to_thread(video_metadata, file)
+        if len(_META_CACHE) >= META_CACHE_SIZE:
+            _META_CACHE.pop(next(iter(_META_CACHE)))
+        _META_CACHE[key] = meta
+    return dict(meta)
+
 def hhmmss(seconds):
     return time.strftime('%H:%M:%S', time.gmtime(seconds))
 
@@ -361,20 +546,24 @@ async def screenshot(video: str, duration: float, sender: int):
     try:
         if os.path.exists(f'{sender}.jpg'):
             return f'{sender}.jpg'
+        # deterministic name so repeated calls for the same video reuse the shot
+        out = f"{sender}_{abs(hash((video, duration)))}.jpg"
+        if os.path.exists(out):
+            return out
         # compute timestamp in format HH:MM:SS
         midpoint = int(duration / 2) if duration else 0
         time_stamp = hhmmss(midpoint)
-        out = dt.now().isoformat("_", "seconds") + ".jpg"
         cmd = [
             "ffmpeg",
+            "-loglevel", "error",
             "-ss", f"{time_stamp}",
             "-i", f"{video}",
             "-frames:v", "1",
             f"{out}",
             "-y"
         ]
-        process = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-        stdout, stderr = await process.communicate()
+        process = await asyncio.create_subprocess_exec(*cmd, stdout=DEVNULL, stderr=DEVNULL)
+        await process.wait()
         if os.path.isfile(out):
             return out
         return None
@@ -383,41 +572,30 @@ async def screenshot(video: str, duration: float, sender: int):
         return None
 
 # ---------- Progress callback (alt) ----------
-last_update_time = time.time()
-
 async def progress_callback(current, total, progress_message):
     """
     Simpler periodic progress editor for Telethon messages.
     progress_message: Telethon Message object (with .edit or .edit_text)
     """
     try:
+        # throttled per message, so concurrent uploads don't suppress each other
+        if not _progress_due(progress_message, current, total):
+            return
         percent = (current / total) * 100 if total else 0
-        global last_update_time
-        current_time = time.time()
-        if current_time - last_update_time >= 10 or (percent % 10 == 0 and percent != 0):
-            completed_blocks = int(percent // 10)
-            remaining_blocks = 10 - completed_blocks
-            progress_bar = "♦" * completed_blocks + "◇" * remaining_blocks
-            current_mb = current / (1024 * 1024) if current else 0
-            total_mb = total / (1024 * 1024) if total else 0
-            text = (
-                "╭──────────────────╮\n"
-                "│        **__Uploading...__**       \n"
-                "├──────────\n"
-                f"│ {progress_bar}\n\n"
-                f"│ **__Progress:__** {percent:.2f}%\n"
-                f"│ **__Uploaded:__** {current_mb:.2f} MB / {total_mb:.2f} MB\n"
-                "╰──────────────────╯\n\n"
-                "**__Powered by unknown man__**"
-            )
-            try:
-                if hasattr(progress_message, "edit"):
-                    await progress_message.edit(text)
-                elif hasattr(progress_message, "edit_text"):
-                    await progress_message.edit_text(text)
-            except Exception:
-                pass
-            last_update_time = current_time
+        progress_bar = _BARS[min(10, max(0, int(percent // 10)))]
+        current_mb = current / (1024 * 1024) if current else 0
+        total_mb = total / (1024 * 1024) if total else 0
+        text = (
+            "╭──────────────────╮\n"
+            "│        **__Uploading...__**       \n"
+            "├──────────\n"
+            f"│ {progress_bar}\n\n"
+            f"│ **__Progress:__** {percent:.2f}%\n"
+            f"│ **__Uploaded:__** {current_mb:.2f} MB / {total_mb:.2f} MB\n"
+            "╰──────────────────╯\n\n"
+            "**__Powered by unknown man__**"
+        )
+        await safe_edit(progress_message, text, wait=current == total)
     except Exception as e:
         print(f"[progress_callback] {e}")
 
@@ -426,35 +604,8 @@ async def prog_bar(current, total, ud_type, message, start):
     Alternate progress function that edits message text (keeps compatibility with prior naming).
     """
     try:
-        now = time.time()
-        diff = now - start
-        if diff <= 0:
-            diff = 0.1
-        if round(diff % 10.00) == 0 or current == total:
-            percentage = (current * 100) / total if total else 0
-            speed = current / diff if diff else 0
-            elapsed_time = round(diff) * 1000
-            time_to_completion = round((total - current) / speed) * 1000 if speed else 0
-            estimated_total_time = elapsed_time + time_to_completion
-            elapsed_time_str = TimeFormatter(milliseconds=elapsed_time)
-            estimated_total_time_str = TimeFormatter(milliseconds=estimated_total_time)
-            progress = "{0}{1}".format(
-                ''.join(["♦" for i in range(math.floor(percentage / 10))]),
-                ''.join(["◇" for i in range(10 - math.floor(percentage / 10))])
-            )
-            tmp = progress + PROGRESS_BAR.format(
-                round(percentage, 2),
-                humanbytes(current),
-                humanbytes(total),
-                humanbytes(speed),
-                estimated_total_time_str if estimated_total_time_str != '' else "0 s"
-            )
-            try:
-                if hasattr(message, "edit"):
-                    await message.edit(text=f"{ud_type}\n│ {tmp}")
-                elif hasattr(message, "edit_text"):
-                    await message.edit_text(text=f"{ud_type}\n│ {tmp}")
-            except Exception:
-                pass
+        if not _progress_due(message, current, total):
+            return
+        await safe_edit(message, f"{ud_type}\n│ {_render_progress(current, total, start)}", wait=current == total)
     except Exception as e:
         print(f"[prog_bar] {e}")
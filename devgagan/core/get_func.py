@@ -8,103 +8,296 @@
 # ---------------------------------------------------
 
 import asyncio
+import atexit
+import logging
+import logging.handlers
+import math
+import queue
 import os
 import re
+import shutil
+import tempfile
 import time
-import gc
 import subprocess
-from typing import Dict, Set, Optional, Any, Tuple
+from typing import Dict, Set, FrozenSet, Optional, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
-from collections import defaultdict
+from functools import lru_cache
 
-import aiofiles
-import pymongo
+from cachetools import LRUCache, TTLCache
+from motor.motor_asyncio import AsyncIOMotorClient
 from telethon import events, Button
 from telethon.tl.types import DocumentAttributeVideo
 from telethon.errors import RPCError, FloodWait, ChatAdminRequired
 
 # Your project imports (ensure devgagan.sex is Telethon client)
 from devgagan import sex as gf        # Telethon userbot (main client now)
-from devgagan import pro if 'pro' in globals() else None  # optional pro client if configured
+try:
+    from devgagan import pro         # optional pro client if configured
+except Exception:
+    pro = None
 from devgagantools import fast_upload  # fast_upload used for Telethon uploads (if available)
-from devgagan.core.func import progress_bar, video_metadata, screenshot
+from devgagan.core.func import progress_bar, video_metadata_async, screenshot, safe_edit, chk_user
 from devgagan.core.mongo import db as odb
 from config import MONGO_DB as MONGODB_CONNECTION_STRING, LOG_GROUP, OWNER_ID
 
+# Log records are handed to a background thread, so error bursts never wait
+# on the stdout lock inside the event loop.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, *(logging.getLogger().handlers or [logging.StreamHandler()]), respect_handler_level=True
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logger = logging.getLogger("get_func")
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
 # ----------------- Config / Dataclasses -----------------
+VIDEO_EXTS = frozenset({
+    'mp4', 'mov', 'avi', 'mkv', 'flv', 'wmv', 'webm', 'mpg', 'mpeg',
+    '3gp', 'ts', 'm4v', 'f4v', 'vob'
+})
+DOC_EXTS = frozenset({'pdf', 'docx', 'txt', 'epub', 'docs'})
+IMG_EXTS = frozenset({'jpg', 'jpeg', 'png', 'webp'})
+AUDIO_EXTS = frozenset({'mp3', 'wav', 'flac', 'aac', 'm4a', 'ogg'})
+
+# captions longer than this are regex-processed in a worker thread
+CPU_OFFLOAD_CHARS = 2048
+
+# extension -> media type in one lookup
+_EXT2TYPE: Dict[str, str] = (
+    {e: 'document' for e in DOC_EXTS} | {e: 'audio' for e in AUDIO_EXTS}
+    | {e: 'photo' for e in IMG_EXTS} | {e: 'video' for e in VIDEO_EXTS}
+)
+
 @dataclass
 class BotConfig:
     DB_NAME: str = "smart_users"
     COLLECTION_NAME: str = "super_user"
-    VIDEO_EXTS: Set[str] = field(default_factory=lambda: {
-        'mp4', 'mov', 'avi', 'mkv', 'flv', 'wmv', 'webm', 'mpg', 'mpeg',
-        '3gp', 'ts', 'm4v', 'f4v', 'vob'
-    })
-    DOC_EXTS: Set[str] = field(default_factory=lambda: {'pdf', 'docx', 'txt', 'epub', 'docs'})
-    IMG_EXTS: Set[str] = field(default_factory=lambda: {'jpg', 'jpeg', 'png', 'webp'})
-    AUDIO_EXTS: Set[str] = field(default_factory=lambda: {'mp3', 'wav', 'flac', 'aac', 'm4a', 'ogg'})
+    VIDEO_EXTS: FrozenSet[str] = VIDEO_EXTS
+    DOC_EXTS: FrozenSet[str] = DOC_EXTS
+    IMG_EXTS: FrozenSet[str] = IMG_EXTS
+    AUDIO_EXTS: FrozenSet[str] = AUDIO_EXTS
     SIZE_LIMIT: int = 2 * 1024**3  # 2GB
     PART_SIZE: int = int(1.9 * 1024**3)  # 1.9GB splitting
     SETTINGS_PIC: str = "settings.jpg"
 
+@dataclass(slots=True)
+class UserState:
+    """Everything the bot keeps in memory about one user."""
+    session: Optional[str] = None     # pending settings input, e.g. 'setchat'
+    chat_id: Optional[int] = None     # target chat for uploads
+    rename: str = ""
+    caption: str = ""
+    pending_photo: bool = False       # next photo becomes the thumbnail
+
 @dataclass
 class UserProgress:
     previous_done: int = 0
     previous_time: float = field(default_factory=time.time)
 
 # ----------------- Database Manager -----------------
+# One pooled client shared by every DatabaseManager
+_MONGO = AsyncIOMotorClient(
+    MONGODB_CONNECTION_STRING,
+    maxPoolSize=50,
+    minPoolSize=5,
+    socketTimeoutMS=5000,
+    waitQueueTimeoutMS=2000,
+    retryWrites=True,
+)
+
+PROTECTED_CACHE_TTL = 60
+WRITE_FLUSH_INTERVAL = 0.1  # seconds queued settings writes wait to be merged
+
+# Settings read on every download; fetched together by prefetch_user()
+_USER_KEYS = {
+    "delete_words": 1, "replacement_words": 1, "rename_tag": 1,
+    "custom_caption": 1, "upload_method": 1,
+}
+
+@lru_cache(maxsize=1024)
+def _word_pattern(words: Tuple[str, ...]):
+    # longest first so "foo bar" wins over "foo" at the same position
+    return re.compile("|".join(map(re.escape, sorted(words, key=len, reverse=True))))
+
+def _substitute_words(merged: Dict[str, str], text: str) -> str:
+    """Leftmost-longest, non-overlapping substitution of every key in `merged`."""
+    return _word_pattern(tuple(sorted(merged))).sub(lambda m: merged[m.group(0)], text)
+
+# shared "user has no word rules" entry; checked by identity on the hot path
+_NO_RULES = (None, {})
+
+def _compile_rules(delete_words, replacements: Dict[str, str], delete_fill: str):
+    """
+    Split a user's rules into (translate table for single-char deletions,
+    word -> substitute for everything else).
+    """
+    merged = {k: v for k, v in replacements.items() if k}
+    singles = {w for w in delete_words if len(w) == 1 and w not in merged}
+    merged.update((w, delete_fill) for w in delete_words if len(w) > 1 and w not in merged)
+    if not singles and not merged:
+        return _NO_RULES
+    trans = str.maketrans({c: delete_fill for c in singles}) if singles else None
+    return trans, merged
+
+def _apply_rules(rules, text: str) -> str:
+    trans, merged = rules
+    if trans:
+        text = text.translate(trans)
+    if merged:
+        text = _substitute_words(merged, text)
+    return text
+
 class DatabaseManager:
-    def __init__(self, connection_string: str, db_name: str, collection_name: str):
-        self.client = pymongo.MongoClient(connection_string)
+    def __init__(self, client: AsyncIOMotorClient, db_name: str, collection_name: str):
+        self.client = client
         self.collection = self.client[db_name][collection_name]
-        self._cache = {}
+        # bounded so RSS stays flat, short TTL so edits from other paths show up
+        self._cache = TTLCache(maxsize=10000, ttl=300)
+        # (user_id, delete_fill) -> compiled word rules; dropped on every rules write
+        self._rules = TTLCache(maxsize=1024, ttl=300)
+        self._indexed = False
+        self._protected: Set[int] = set()
+        self._protected_ts: float = 0.0
+        self._write_queue: asyncio.Queue = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+
+    async def _ensure_indexes(self):
+        if self._indexed:
+            return
+        self._indexed = True
+        try:
+            # lets get_protected_channels() use an index scan
+            await self.collection.create_index("channel_id", sparse=True)
+        except Exception as e:
+            logger.error(f"[DB index] {e}")
 
-    def get_user_data(self, user_id: int, key: str, default=None) -> Any:
+    async def get_user_data(self, user_id: int, key: str, default=None) -> Any:
         cache_key = f"{user_id}:{key}"
         if cache_key in self._cache:
             return self._cache[cache_key]
+        if key in _USER_KEYS:
+            # the prefetched document is one entry, so it is evicted as a whole
+            doc = self._cache.get(f"{user_id}:")
+            if doc is not None:
+                return doc.get(key, default)
         try:
-            doc = self.collection.find_one({"_id": user_id})
+            doc = await self.collection.find_one({"_id": user_id})
             value = doc.get(key, default) if doc else default
             self._cache[cache_key] = value
             return value
         except Exception as e:
-            print(f"[DB read] {e}")
+            logger.error(f"[DB read] {e}")
             return default
 
-    def save_user_data(self, user_id: int, key: str, value: Any) -> bool:
-        cache_key = f"{user_id}:{key}"
+    async def prefetch_user(self, user_id: int):
+        """Load every per-user setting in one round trip and fill the cache."""
         try:
-            self.collection.update_one({"_id": user_id}, {"$set": {key: value}}, upsert=True)
-            self._cache[cache_key] = value
-            return True
+            doc = await self.collection.find_one({"_id": user_id}, _USER_KEYS)
         except Exception as e:
-            print(f"[DB save] {e}")
-            return False
+            logger.error(f"[DB prefetch] {e}")
+            return
+        doc = doc or {}
+        self._cache[f"{user_id}:"] = {key: doc[key] for key in _USER_KEYS if key in doc}
+
+    async def apply_word_filters(self, user_id: int, text: str, delete_fill: str = "") -> str:
+        """Apply the user's delete words and replacements in a single pass."""
+        if not text:
+            return text
+        rules = self._rules.get((user_id, delete_fill))
+        if rules is None:
+            delete_words = await self.get_user_data(user_id, "delete_words", [])
+            replacements = await self.get_user_data(user_id, "replacement_words", {})
+            rules = _compile_rules(delete_words, replacements, delete_fill)
+            self._rules[(user_id, delete_fill)] = rules
+        if rules is _NO_RULES:
+            return text
+        if len(text) > CPU_OFFLOAD_CHARS:
+            return await asyncio.to_thread(_apply_rules, rules, text)
+        return _apply_rules(rules, text)
+
+    def _remember(self, user_id: int, updates: Dict[str, Any]):
+        self._cache.update({f"{user_id}:{k}": v for k, v in updates.items()})
+        doc = self._cache.get(f"{user_id}:")
+        if doc is not None:
+            doc.update({k: v for k, v in updates.items() if k in _USER_KEYS})
+        if "delete_words" in updates or "replacement_words" in updates:
+            self._drop_rules(user_id)
+
+    def queue_save(self, user_id: int, key: str, value: Any):
+        """
+        Write-back save: the cache sees the value at once, Mongo gets it on
+        the next flush. Writes queued within WRITE_FLUSH_INTERVAL are merged
+        into one update per user, keeping only the latest value per key.
+        """
+        self._remember(user_id, {key: value})
+        self._write_queue.put_nowait((user_id, key, value))
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer())
+
+    async def flush_writes(self):
+        """Wait until every queued write has reached Mongo."""
+        if self._writer_task is not None and not self._writer_task.done():
+            await self._write_queue.join()
+
+    async def _writer(self):
+        while True:
+            user_id, key, value = await self._write_queue.get()
+            pending = {user_id: {key: value}}
+            taken = 1
+            await asyncio.sleep(WRITE_FLUSH_INTERVAL)
+            while not self._write_queue.empty():
+                user_id, key, value = self._write_queue.get_nowait()
+                pending.setdefault(user_id, {})[key] = value
+                taken += 1
+            for user_id, updates in pending.items():
+                try:
+                    await self.collection.update_one({"_id": user_id}, {"$set": updates}, upsert=True)
+                except Exception as e:
+                    logger.error(f"[DB write-back] {e}")
+            for _ in range(taken):
+                self._write_queue.task_done()
+
+    def _drop_rules(self, user_id: int):
+        for k in [k for k in self._rules.keys() if k[0] == user_id]:
+            self._rules.pop(k, None)
 
     def clear_user_cache(self, user_id: int):
         keys_to_remove = [k for k in self._cache.keys() if k.startswith(f"{user_id}:")]
         for k in keys_to_remove:
             del self._cache[k]
+        self._drop_rules(user_id)
 
-    def get_protected_channels(self) -> Set[int]:
+    async def get_protected_channels(self) -> Set[int]:
+        # read on every download; refresh from Mongo at most once a minute
+        if time.monotonic() - self._protected_ts < PROTECTED_CACHE_TTL:
+            return self._protected
+        await self._ensure_indexes()
         try:
-            return {doc["channel_id"] for doc in self.collection.find({"channel_id": {"$exists": True}})}
-        except Exception:
-            return set()
+            cursor = self.collection.find({"channel_id": {"$exists": True}}, {"channel_id": 1, "_id": 0})
+            self._protected = {doc["channel_id"] async for doc in cursor}
+            self._protected_ts = time.monotonic()
+        except Exception as e:
+            logger.error(f"[DB protected] {e}")
+        return self._protected
 
-    def lock_channel(self, channel_id: int) -> bool:
+    async def lock_channel(self, channel_id: int) -> bool:
         try:
-            self.collection.insert_one({"channel_id": channel_id})
+            await self.collection.insert_one({"channel_id": channel_id})
+            self._protected.add(channel_id)
             return True
         except Exception:
             return False
 
-    def reset_user_data(self, user_id: int) -> bool:
+    async def reset_user_data(self, user_id: int) -> bool:
+        # a queued write landing after the $unset would resurrect old settings
+        await self.flush_writes()
         try:
-            self.collection.update_one({"_id": user_id}, {"$unset": {
+            await self.collection.update_one({"_id": user_id}, {"$unset": {
                 "delete_words": "", "replacement_words": "",
                 "watermark_text": "", "duration_limit": "",
                 "custom_caption": "", "rename_tag": ""
@@ -112,7 +305,7 @@ class DatabaseManager:
             self.clear_user_cache(user_id)
             return True
         except Exception as e:
-            print(f"[DB reset] {e}")
+            logger.error(f"[DB reset] {e}")
             return False
 
 # ----------------- Media Processor -----------------
@@ -121,62 +314,56 @@ class MediaProcessor:
         self.config = config
 
     def get_file_type(self, filename: str) -> str:
-        ext = Path(filename).suffix.lower().lstrip('.')
-        if ext in self.config.VIDEO_EXTS:
-            return 'video'
-        if ext in self.config.IMG_EXTS:
-            return 'photo'
-        if ext in self.config.AUDIO_EXTS:
-            return 'audio'
-        if ext in self.config.DOC_EXTS:
-            return 'document'
-        return 'document'
+        return _EXT2TYPE.get(Path(filename).suffix[1:].lower(), 'document')
 
     @staticmethod
     def get_media_info(msg) -> Tuple[Optional[str], Optional[int], str]:
-        # Telethon message object attributes differ; check common ones
+        # msg.file wraps any media: name comes from DocumentAttributeFilename,
+        # ext from the MIME type when the sender gave no name
+        f = getattr(msg, 'file', None)
+        fname = getattr(f, 'name', None)
+        ext = getattr(f, 'ext', None) or ""
+        size = getattr(f, 'size', None)
         if getattr(msg, 'document', None):
-            name = getattr(msg.document, 'attributes', None)
-            # Telethon document.filename may exist:
-            try:
-                fname = msg.document.file_name
-            except Exception:
-                fname = "document"
-            size = getattr(msg.document, 'size', None)
-            return fname or "document", size, "document"
+            return fname or f"document{ext}", size, "document"
         if getattr(msg, 'video', None):
-            fname = getattr(msg.video, 'file_name', None) or "video.mp4"
-            size = getattr(msg.video, 'size', None)
-            return fname, size, "video"
+            return fname or "video.mp4", size, "video"
         if getattr(msg, 'photo', None):
-            return "photo.jpg", getattr(msg.photo, 'sizes', [None]) and 1, "photo"
+            return "photo.jpg", size or 1, "photo"
         if getattr(msg, 'audio', None):
-            fname = getattr(msg.audio, 'file_name', None) or "audio.mp3"
-            size = getattr(msg.audio, 'size', None)
-            return fname, size, "audio"
+            return fname or "audio.mp3", size, "audio"
         if getattr(msg, 'voice', None):
-            return "voice.ogg", getattr(msg.voice, 'size', 1), "voice"
+            return "voice.ogg", size or 1, "voice"
         return "unknown", 1, "document"
 
 # ----------------- Progress Manager -----------------
+_PROGRESS_BARS = tuple("♦" * i + "◇" * (10 - i) for i in range(11))
+
+class _ProgressLRU(LRUCache):
+    # defaultdict-style: first lookup for a user creates its entry
+    def __missing__(self, key):
+        value = self[key] = UserProgress()
+        return value
+
 class ProgressManager:
     def __init__(self):
-        self.user_progress: Dict[int, UserProgress] = defaultdict(UserProgress)
+        self.user_progress: Dict[int, UserProgress] = _ProgressLRU(maxsize=10000)
 
     def calculate_progress(self, done: int, total: int, user_id: int, uploader: str = "SpyLib") -> str:
         user_data = self.user_progress[user_id]
+        now = time.time()
         percent = (done / total) * 100 if total else 0
-        progress_bar_txt = "♦" * int(percent // 10) + "◇" * (10 - int(percent // 10))
+        progress_bar_txt = _PROGRESS_BARS[min(10, int(percent // 10))]
         done_mb, total_mb = done / (1024**2), total / (1024**2) if total else 0
 
         speed = max(0, done - user_data.previous_done)
-        elapsed_time = max(0.1, time.time() - user_data.previous_time)
-        speed_mbps = (speed * 8) / (1024**2 * elapsed_time) if elapsed_time > 0 else 0
-        eta_seconds = ((total - done) / speed) if speed > 0 else 0
+        elapsed_time = max(0.1, now - user_data.previous_time)
+        speed_mbps = (speed * 8) / (1024**2 * elapsed_time)
+        eta_seconds = ((total - done) * elapsed_time / speed) if speed > 0 else 0
         eta_min = eta_seconds / 60 if eta_seconds else 0
 
         user_data.previous_done = done
-        user_data.previous_time = time.time()
+        user_data.previous_time = now
 
         return (
             f"╭──────────────────╮\n"
@@ -192,29 +379,64 @@ class ProgressManager:
         )
 
 # ----------------- Caption Formatter -----------------
+# Compiled once; "**x**"/"*x*" and "__x__"/"_x_" share one pattern via a backreference
+_MD_PATTERNS = [(re.compile(p, re.MULTILINE | re.DOTALL), r) for p, r in (
+    (r"^> (.*)", r"<blockquote>\1</blockquote>"),
+    (r"```(.*?)```", r"<pre>\1</pre>"),
+    (r"`(.*?)`", r"<code>\1</code>"),
+    (r"(\*\*?)(.*?)\1", r"<b>\2</b>"),
+    (r"(__?)(.*?)\1", r"<i>\2</i>"),
+    (r"~~(.*?)~~", r"<s>\1</s>"),
+    (r"\|\|(.*?)\|\|", r"<details>\1</details>"),
+    (r"\[(.*?)\]\((.*?)\)", r'<a href="\2">\1</a>'),
+)]
+
+# every pattern above needs at least one of these characters
+_MD_CHARS = frozenset("*_`~|[>")
+
 class CaptionFormatter:
     @staticmethod
-    async def markdown_to_html(caption: str) -> str:
+    def markdown_to_html(caption: str) -> str:
         if not caption:
             return ""
-        replacements = [
-            (r"^> (.*)", r"<blockquote>\1</blockquote>"),
-            (r"```(.*?)```", r"<pre>\1</pre>"),
-            (r"`(.*?)`", r"<code>\1</code>"),
-            (r"\*\*(.*?)\*\*", r"<b>\1</b>"),
-            (r"\*(.*?)\*", r"<b>\1</b>"),
-            (r"__(.*?)__", r"<i>\1</i>"),
-            (r"_(.*?)_", r"<i>\1</i>"),
-            (r"~~(.*?)~~", r"<s>\1</s>"),
-            (r"\|\|(.*?)\|\|", r"<details>\1</details>"),
-            (r"\[(.*?)\]\((.*?)\)", r'<a href="\2">\1</a>')
-        ]
+        if _MD_CHARS.isdisjoint(caption):
+            return caption.strip()
         result = caption
-        for pattern, replacement in replacements:
-            result = re.sub(pattern, replacement, result, flags=re.MULTILINE | re.DOTALL)
+        for pattern, replacement in _MD_PATTERNS:
+            result = pattern.sub(replacement, result)
         return result.strip()
 
+    @staticmethod
+    async def markdown_to_html_async(caption: str) -> str:
+        # long captions are converted off the event loop
+        if caption and len(caption) > CPU_OFFLOAD_CHARS:
+            return await asyncio.to_thread(CaptionFormatter.markdown_to_html, caption)
+        return CaptionFormatter.markdown_to_html(caption)
+
 # ----------------- File Operations -----------------
+async def _safe_unlink(path: Optional[str]):
+    """Remove `path` in a worker thread; a missing file is not an error."""
+    if not path:
+        return
+    try:
+        await asyncio.to_thread(os.remove, path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"[cleanup] {e}")
+
+DOWNLOAD_DIR = "downloads"
+
+def _download_path(filename: str) -> str:
+    """Path for one download: a private directory keeps the real name without clashes."""
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+    return os.path.join(tempfile.mkdtemp(dir=DOWNLOAD_DIR), os.path.basename(filename))
+
+async def _discard_download(path: Optional[str]):
+    """Remove a _download_path() file together with its directory."""
+    if path:
+        await asyncio.to_thread(shutil.rmtree, os.path.dirname(path), True)
+
 class FileOperations:
     def __init__(self, config: BotConfig, db: DatabaseManager):
         self.config = config
@@ -228,33 +450,30 @@ class FileOperations:
             await self._cleanup_file(file_path)
 
     async def _cleanup_file(self, file_path: str):
-        if file_path and os.path.exists(file_path):
-            try:
-                await asyncio.to_thread(os.remove, file_path)
-            except Exception as e:
-                print(f"[cleanup] {e}")
+        await _safe_unlink(file_path)
 
-    async def process_filename(self, file_path: str, user_id: int) -> str:
-        delete_words = set(self.db.get_user_data(user_id, "delete_words", []))
-        replacements = self.db.get_user_data(user_id, "replacement_words", {})
-        rename_tag = self.db.get_user_data(user_id, "rename_tag", "unknown man")
+    async def processed_name(self, file_name: str, user_id: int) -> str:
+        """The name process_filename() would give `file_name`, without touching disk."""
+        rename_tag = await self.db.get_user_data(user_id, "rename_tag", "unknown man")
 
-        path = Path(file_path)
-        name = path.stem
-        extension = path.suffix.lstrip('.')
-
-        for word in delete_words:
-            name = name.replace(word, "")
-
-        for word, replacement in replacements.items():
-            name = name.replace(word, replacement)
+        path = Path(file_name)
+        name = await self.db.apply_word_filters(user_id, path.stem)
+        extension = path.suffix[1:]
 
-        if extension.lower() in self.config.VIDEO_EXTS and extension.lower() not in ['mp4']:
+        ext = extension.lower()
+        if ext != 'mp4' and _EXT2TYPE.get(ext) == 'video':
             extension = 'mp4'
 
-        new_name = f"{name.strip()} {rename_tag}.{extension}"
+        return f"{name.strip()} {rename_tag}.{extension}"
+
+    async def process_filename(self, file_path: str, user_id: int) -> str:
+        path = Path(file_path)
+        new_name = await self.processed_name(path.name, user_id)
+        if new_name == path.name:
+            return file_path
         new_path = path.parent / new_name
-        await asyncio.to_thread(os.rename, file_path, new_path)
+        # same directory, so this is a single metadata syscall; no thread hop needed
+        os.replace(file_path, new_path)
         return str(new_path)
 
     async def split_large_file(self, file_path: str, app_client, sender: int, target_chat_id: int, caption: str, topic_id: Optional[int] = None):
@@ -265,42 +484,70 @@ class FileOperations:
         file_size = os.path.getsize(file_path)
         start_msg = await app_client.send_message(sender, f"ℹ️ File size: {file_size / (1024**2):.2f} MB\n🔄 Splitting and uploading...")
 
-        part_number = 0
+        # Parts are uploaded straight from byte ranges of the source, so no
+        # part file is ever written to disk.
         base_path = Path(file_path)
-
+        part_size = self.config.PART_SIZE
+        src_fd = os.open(file_path, os.O_RDONLY)
         try:
-            async with aiofiles.open(file_path, mode="rb") as f:
-                while True:
-                    chunk = await f.read(self.config.PART_SIZE)
-                    if not chunk:
-                        break
-                    part_file = f"{base_path.stem}.part{str(part_number).zfill(3)}{base_path.suffix}"
-                    async with aiofiles.open(part_file, mode="wb") as part_f:
-                        await part_f.write(chunk)
-
-                    part_caption = f"{caption}\n\n**Part: {part_number + 1}**" if caption else f"**Part: {part_number + 1}**"
-                    edit_msg = await app_client.send_message(target_chat_id, f"⬆️ Uploading part {part_number + 1}...")
-                    try:
-                        # Use Telethon send_file for parts
-                        sent = await app_client.send_file(
-                            target_chat_id,
-                            part_file,
-                            caption=part_caption
-                        )
-                        # copy to log group
-                        try:
-                            await app_client.send_file(LOG_GROUP, part_file, caption=part_caption)
-                        except:
-                            pass
-                        await app_client.delete_messages(edit_msg.peer_id, [edit_msg.id])
-                    finally:
-                        if os.path.exists(part_file):
-                            os.remove(part_file)
-                    part_number += 1
+            if hasattr(os, "posix_fadvise"):
+                # one sequential pass: ask for aggressive readahead
+                os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            for part_number, offset in enumerate(range(0, file_size, part_size)):
+                length = min(part_size, file_size - offset)
+                part_name = f"{base_path.stem}.part{str(part_number).zfill(3)}{base_path.suffix}"
+                part_caption = f"{caption}\n\n**Part: {part_number + 1}**" if caption else f"**Part: {part_number + 1}**"
+                edit_msg = await app_client.send_message(target_chat_id, f"⬆️ Uploading part {part_number + 1}...")
+                input_file = await app_client.upload_file(
+                    _RangeReader(src_fd, offset, length, part_name),
+                    file_size=length,
+                    file_name=part_name
+                )
+                sent = await app_client.send_file(target_chat_id, input_file, caption=part_caption)
+                # copy to log group, reusing the uploaded media
+                try:
+                    await app_client.send_file(LOG_GROUP, sent.media, caption=part_caption)
+                except:
+                    pass
+                await app_client.delete_messages(edit_msg.peer_id, [edit_msg.id])
         finally:
+            os.close(src_fd)
             await app_client.delete_messages(start_msg.peer_id, [start_msg.id]) if start_msg else None
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            await _safe_unlink(file_path)
+
+RANGE_READ_BLOCK = 8 * 1024**2
+
+class _RangeReader:
+    """Async file-like view over `length` bytes of `fd` starting at `offset`.
+
+    The uploader asks for small parts; the file is read with pread in
+    RANGE_READ_BLOCK blocks so most reads need no thread hop.
+    """
+    def __init__(self, fd: int, offset: int, length: int, name: str):
+        self._fd = fd
+        self._pos = offset            # next file offset to pread
+        self._end = offset + length
+        self._buf = b""
+        self._buf_pos = 0
+        self._left = length           # bytes not yet handed out
+        self.name = name
+
+    async def read(self, n: int = -1) -> bytes:
+        if self._left <= 0:
+            return b""
+        if n < 0 or n > self._left:
+            n = self._left
+        if self._buf_pos + n > len(self._buf):
+            tail = self._buf[self._buf_pos:]
+            want = max(n - len(tail), min(RANGE_READ_BLOCK, self._end - self._pos))
+            block = await asyncio.to_thread(os.pread, self._fd, want, self._pos)
+            self._pos += len(block)
+            self._buf = tail + block
+            self._buf_pos = 0
+        data = self._buf[self._buf_pos:self._buf_pos + n]
+        self._buf_pos += len(data)
+        self._left -= len(data)
+        return data
 
 # ----------------- Telethon helper wrappers -----------------
 async def tele_send_message(chat_id, text, **kwargs):
@@ -323,36 +570,164 @@ async def tele_send_file(chat_id, file, caption=None, thumb=None, attributes=Non
     # gf.send_file accepts file path or uploaded object; this wrapper keeps it simple
     return await gf.send_file(chat_id, file, **params)
 
+# Parallel download: Telegram serves files in independent byte ranges, so
+# several concurrent GetFile streams fill one link far better than one.
+DL_CHUNK = 512 * 1024           # Telethon's largest allowed request size
+DL_MIN_PARALLEL = 10 * 1024**2  # below this a single stream is fine
+DL_MAX_STREAMS = 8
+
+async def tele_fast_download(client, msg, filename: str, progress_callback=None) -> str:
+    size = getattr(getattr(msg, 'file', None), 'size', 0) or 0
+    if size < DL_MIN_PARALLEL:
+        return await client.download_media(msg, file=filename, progress_callback=progress_callback)
+
+    total_chunks = math.ceil(size / DL_CHUNK)
+    streams = min(math.ceil(size / DL_MIN_PARALLEL), DL_MAX_STREAMS)
+    per_stream = math.ceil(total_chunks / streams)
+    done = 0
+
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size)
+
+        async def fetch(first_chunk: int, chunks: int):
+            nonlocal done
+            pos = first_chunk * DL_CHUNK
+            async for data in client.iter_download(msg, offset=pos, limit=chunks, request_size=DL_CHUNK, file_size=size):
+                os.pwrite(fd, data, pos)
+                pos += len(data)
+                done += len(data)
+                if progress_callback:
+                    progress_callback(done, size)
+
+        async with asyncio.TaskGroup() as tg:
+            for first in range(0, total_chunks, per_stream):
+                tg.create_task(fetch(first, min(per_stream, total_chunks - first)))
+    except BaseException:
+        os.close(fd)
+        fd = None
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        raise
+    finally:
+        if fd is not None:
+            os.close(fd)
+    return filename
+
+# t.me/c/<id>/.../<msg>, t.me/b/<bot>/<msg>, t.me/<user>/s/<story>, t.me/<chat>/<msg>
+_LINK_RE = re.compile(
+    r"t\.me/(?:(?P<kind>[cb])/(?P<chat>[^/]+)|(?P<story>[^/]+)/s|(?P<pub>[^/]+))"
+    r"/(?:.*/)?(?P<msg>\d+)/?$"
+)
+
+class _QueueReader:
+    """Async file-like object fed with byte chunks through a queue; None ends it."""
+    def __init__(self, queue: asyncio.Queue, name: str):
+        self._queue = queue
+        self._buf = b""
+        self._eof = False
+        self.name = name
+
+    async def read(self, n: int = -1) -> bytes:
+        while not self._eof and (n < 0 or len(self._buf) < n):
+            chunk = await self._queue.get()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buf += chunk
+        if n < 0:
+            n = len(self._buf)
+        data, self._buf = self._buf[:n], self._buf[n:]
+        return data
+
+STREAM_QUEUE_SIZE = 8
+
+async def tele_stream_copy(src_client, dst_client, msg, file_name: str, size: int):
+    """
+    Download `msg` with `src_client` and upload it with `dst_client` at the
+    same time: chunks go from iter_download straight into upload_file through
+    a small queue, so nothing touches disk and the wall time is roughly the
+    slower of the two legs instead of their sum. Returns the InputFile.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+    async def produce():
+        async for chunk in src_client.iter_download(msg, request_size=DL_CHUNK, file_size=size):
+            await queue.put(chunk)
+        await queue.put(None)
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(produce())
+        upload = tg.create_task(dst_client.upload_file(_QueueReader(queue, file_name), file_size=size, file_name=file_name))
+    return upload.result()
+
+def _thumb_path(user_id: int) -> str:
+    """Where a user's custom thumbnail is kept."""
+    return f'{user_id}.jpg'
+
+# The settings panel never changes, so it is built once
+_SETTINGS_BUTTONS = [
+    [Button.inline("Set Chat ID", b'setchat'), Button.inline("Set Rename Tag", b'setrename')],
+    [Button.inline("Caption", b'setcaption'), Button.inline("Replace Words", b'setreplacement')],
+    [Button.inline("Remove Words", b'delete'), Button.inline("Reset All", b'reset')],
+    [Button.inline("Session Login", b'addsession'), Button.inline("Logout", b'logout')],
+    [Button.inline("Set Thumbnail", b'setthumb'), Button.inline("Remove Thumbnail", b'remthumb')],
+    [Button.inline("PDF Watermark", b'pdfwt'), Button.inline("Video Watermark", b'watermark')],
+    [Button.inline("Upload Method", b'uploadmethod')],
+    [Button.url("Report Issues", "https://t.me/rajputserver")]
+]
+_SETTINGS_MESSAGE = (
+    "🛠 **Advanced Settings Panel**\n\n"
+    "Customize your bot experience with these options:\n"
+    "• Configure upload methods\n"
+    "• Set custom captions and rename tags\n"
+    "• Manage word filters and replacements\n"
+    "• Handle thumbnails and watermarks\n\n"
+    "Select an option to get started!"
+)
+
 # ----------------- Main Bot Class -----------------
 class SmartTelegramBot:
     def __init__(self):
         self.config = BotConfig()
-        self.db = DatabaseManager(MONGODB_CONNECTION_STRING, self.config.DB_NAME, self.config.COLLECTION_NAME)
+        self.db = DatabaseManager(_MONGO, self.config.DB_NAME, self.config.COLLECTION_NAME)
         self.media_processor = MediaProcessor(self.config)
         self.progress_manager = ProgressManager()
         self.file_ops = FileOperations(self.config, self.db)
         self.caption_formatter = CaptionFormatter()
+        # (client, chat, message id) -> Message, absorbs repeat fetches
+        self._msg_cache = TTLCache(maxsize=1024, ttl=30)
 
-        self.user_sessions: Dict[int, str] = {}
-        self.pending_photos: Set[int] = set()
-        self.user_chat_ids: Dict[int, int] = {}
-        self.user_rename_prefs: Dict[str, str] = {}
-        self.user_caption_prefs: Dict[str, str] = {}
+        self._user_state: Dict[int, UserState] = {}
 
         # Telethon clients
         self.userbot = gf           # primary Telethon client for actions
-        self.pro_client = None
-        try:
-            # If pro client available in devgagan package (as in original), use it
-            from devgagan import pro
-            self.pro_client = pro
-        except Exception:
-            self.pro_client = None
+        self.pro_client = pro
 
-        print(f"Pro client available: {'Yes' if self.pro_client else 'No'}")
+        logger.info(f"Pro client available: {'Yes' if self.pro_client else 'No'}")
+
+    def user_state(self, user_id: int) -> UserState:
+        st = self._user_state.get(user_id)
+        if st is None:
+            st = self._user_state[user_id] = UserState()
+        return st
+
+    def session_of(self, user_id: int) -> Optional[str]:
+        st = self._user_state.get(user_id)
+        return st.session if st else None
+
+    def awaiting_photo(self, user_id: int) -> bool:
+        st = self._user_state.get(user_id)
+        return bool(st and st.pending_photo)
+
+    def target_chat(self, user_id: int) -> str:
+        st = self._user_state.get(user_id)
+        return str(st.chat_id) if st and st.chat_id is not None else str(user_id)
 
     def get_thumbnail_path(self, user_id: int) -> Optional[str]:
-        thumb_path = f'{user_id}.jpg'
+        thumb_path = _thumb_path(user_id)
         return thumb_path if os.path.exists(thumb_path) else None
 
     def parse_target_chat(self, target: str) -> Tuple[int, Optional[int]]:
@@ -362,15 +737,9 @@ class SmartTelegramBot:
         return int(target), None
 
     async def process_user_caption(self, original_caption: str, user_id: int) -> str:
-        custom_caption = self.user_caption_prefs.get(str(user_id), "") or self.db.get_user_data(user_id, "custom_caption", "")
-        delete_words = set(self.db.get_user_data(user_id, "delete_words", []))
-        replacements = self.db.get_user_data(user_id, "replacement_words", {})
-
-        processed = original_caption or ""
-        for word in delete_words:
-            processed = processed.replace(word, "")
-        for word, replacement in replacements.items():
-            processed = processed.replace(word, replacement)
+        st = self._user_state.get(user_id)
+        custom_caption = (st.caption if st else "") or await self.db.get_user_data(user_id, "custom_caption", "")
+        processed = await self.db.apply_word_filters(user_id, original_caption or "")
         if custom_caption:
             processed = f"{processed}\n\n{custom_caption}".strip()
         return processed if processed else None
@@ -388,7 +757,7 @@ class SmartTelegramBot:
                     pass
 
             progress_message = await gf.send_message(user_id, "**__SpyLib ⚡ Uploading...__**")
-            html_caption = await self.caption_formatter.markdown_to_html(caption or "")
+            html_caption = await self.caption_formatter.markdown_to_html_async(caption or "")
 
             # Use fast_upload if available
             uploaded = None
@@ -402,17 +771,17 @@ class SmartTelegramBot:
             file_type = self.media_processor.get_file_type(file_path)
             if file_type == 'video':
                 try:
-                    meta = video_metadata(file_path)
+                    meta = await video_metadata_async(file_path)
                     attributes = [DocumentAttributeVideo(duration=meta.get('duration', 0), w=meta.get('width', 0), h=meta.get('height', 0), supports_streaming=True)]
                 except Exception:
                     attributes = None
 
             # send file to target chat
-            await gf.send_file(target_chat_id, uploaded, caption=html_caption, attributes=attributes, reply_to=topic_id, parse_mode='html')
+            sent = await gf.send_file(target_chat_id, uploaded, caption=html_caption, attributes=attributes, reply_to=topic_id, parse_mode='html')
 
-            # copy to log group
+            # copy to log group, reusing the media Telegram already has
             try:
-                await gf.send_file(LOG_GROUP, uploaded, caption=html_caption, attributes=attributes, parse_mode='html')
+                await gf.send_file(LOG_GROUP, sent.media, caption=html_caption, parse_mode='html')
             except Exception:
                 pass
 
@@ -426,7 +795,7 @@ class SmartTelegramBot:
             try:
                 await gf.send_message(LOG_GROUP, f"**SpyLib Upload Failed:** {str(e)}")
             except:
-                print(f"[upload error] {e}")
+                logger.error(f"[upload error] {e}")
             raise
 
     async def handle_large_file_upload(self, file_path: str, sender: int, edit_msg, caption: str):
@@ -447,19 +816,18 @@ class SmartTelegramBot:
             file_type = self.media_processor.get_file_type(file_path)
             attributes = None
             if file_type == 'video':
-                meta = video_metadata(file_path)
+                meta = await video_metadata_async(file_path)
                 attributes = [DocumentAttributeVideo(duration=meta.get('duration', 0), w=meta.get('width', 0), h=meta.get('height', 0), supports_streaming=True)]
 
             result = await self.pro_client.send_file(LOG_GROUP, file_path, caption=caption, thumb=self.get_thumbnail_path(sender), attributes=attributes)
             # copy to user's target
-            target_chat_str = self.user_chat_ids.get(sender, str(sender))
-            target_chat_id, _ = self.parse_target_chat(target_chat_str)
+            target_chat_id, _ = self.parse_target_chat(self.target_chat(sender))
             await self.pro_client.send_file(target_chat_id, result.media if hasattr(result, 'media') else file_path, caption=caption)
         except Exception as e:
             try:
                 await gf.send_message(LOG_GROUP, f"**4GB Upload Error:** {str(e)}")
             except:
-                print(f"[4GB error] {e}")
+                logger.error(f"[4GB error] {e}")
         finally:
             try:
                 if edit_msg:
@@ -478,14 +846,14 @@ class SmartTelegramBot:
 
         try:
             msg_link = msg_link.split("?single")[0]
-            protected_channels = self.db.get_protected_channels()
+            await self.db.prefetch_user(sender)
+            protected_channels = await self.db.get_protected_channels()
 
             chat_id, msg_id = await self._parse_message_link(msg_link, offset, protected_channels, sender, edit_id)
             if not chat_id:
                 return
 
-            target_chat_str = self.user_chat_ids.get(message.chat.id, str(message.chat.id))
-            target_chat_id, topic_id = self.parse_target_chat(target_chat_str)
+            target_chat_id, topic_id = self.parse_target_chat(self.target_chat(message.chat.id))
 
             # fetch message via userbot (Telethon)
             msg = await userbot.get_messages(chat_id, ids=msg_id)
@@ -517,7 +885,8 @@ class SmartTelegramBot:
             except:
                 edit_msg = None
 
-            file_path = await userbot.download_media(msg, file=filename, progress_callback=lambda d, t: None)
+            file_path = _download_path(filename)
+            file_path = await tele_fast_download(userbot, msg, file_path)
 
             # process caption & filename
             caption = await self.process_user_caption(getattr(msg, 'message', '') or "", sender)
@@ -527,7 +896,7 @@ class SmartTelegramBot:
             if media_type == "photo":
                 sent = await gf.send_file(target_chat_id, file_path, caption=caption, force_document=False)
                 try:
-                    await gf.send_file(LOG_GROUP, file_path, caption=caption)
+                    await gf.send_file(LOG_GROUP, sent.media, caption=caption)
                 except:
                     pass
                 if edit_msg:
@@ -538,14 +907,12 @@ class SmartTelegramBot:
                 return
 
             # check size
-            upload_method = self.db.get_user_data(sender, "upload_method", "SpyLib")  # keep upload_method stored: SpyLib (Telethon) or other
             if file_size and file_size > self.config.SIZE_LIMIT:
                 free_check = 0
-                if 'chk_user' in globals():
-                    try:
-                        free_check = await chk_user(chat_id, sender)
-                    except:
-                        free_check = 0
+                try:
+                    free_check = await chk_user(chat_id, sender)
+                except:
+                    free_check = 0
 
                 if free_check == 1 or not self.pro_client:
                     # split & upload parts
@@ -570,69 +937,47 @@ class SmartTelegramBot:
             except:
                 pass
         except Exception as e:
-            print(f"[handle_message_download] {e}")
+            logger.error(f"[handle_message_download] {e}")
             try:
                 await gf.send_message(LOG_GROUP, f"**Error:** {str(e)}")
             except:
                 pass
         finally:
-            if file_path and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
-            if thumb_path and os.path.exists(thumb_path):
-                try:
-                    os.remove(thumb_path)
-                except:
-                    pass
-            gc.collect()
+            await _discard_download(file_path)
+            await _safe_unlink(thumb_path)
 
     async def _parse_message_link(self, msg_link: str, offset: int, protected_channels: Set[int], sender: int, edit_id: int) -> Tuple[Optional[int], Optional[int]]:
         try:
-            if 't.me/c/' in msg_link or 't.me/b/' in msg_link:
-                parts = msg_link.split("/")
-                if 't.me/b/' in msg_link:
-                    chat_id = parts[-2]
-                    msg_id = int(parts[-1]) + offset
-                else:
-                    chat_id = int('-100' + parts[parts.index('c') + 1])
-                    msg_id = int(parts[-1]) + offset
+            m = _LINK_RE.search(msg_link.split("?")[0])
+            if not m:
+                logger.warning(f"[parse_link] unrecognised link: {msg_link}")
+                return None, None
+            msg_id = int(m["msg"])
 
+            if m["kind"]:
+                chat_id = int('-100' + m["chat"]) if m["kind"] == "c" else m["chat"]
                 if chat_id in protected_channels:
                     try:
                         await gf.send_message(sender, "❌ This channel is protected by unknown Gunman.")
                     except:
                         pass
                     return None, None
+                return chat_id, msg_id + offset
 
-                return chat_id, msg_id
-
-            elif '/s/' in msg_link:
-                # story link
-                try:
-                    await gf.send_message(sender, "📖 Story Link Detected...")
-                except:
-                    pass
-                parts = msg_link.split("/")
-                chat = f"-100{parts[3]}" if parts[3].isdigit() else parts[3]
-                msg_id = int(parts[-1])
+            if m["story"]:
+                status = await self._set_status(None, sender, "📖 Story Link Detected...")
+                story_chat = m["story"]
+                chat = f"-100{story_chat}" if story_chat.isdigit() else story_chat
                 # download story via userbot
-                await self._download_user_stories(gf, chat, msg_id, sender, edit_id)
+                await self._download_user_stories(gf, chat, msg_id, sender, edit_id, status)
                 return None, None
 
-            else:
-                # public link
-                try:
-                    await gf.send_message(sender, "🔗 Public link detected...")
-                except:
-                    pass
-                chat = msg_link.split("t.me/")[1].split("/")[0]
-                msg_id = int(msg_link.split("/")[-1])
-                await self._copy_public_message(gf, gf, sender, chat, msg_id, edit_id)
-                return None, None
+            # public link
+            status = await self._set_status(None, sender, "🔗 Public link detected...")
+            await self._copy_public_message(gf, gf, sender, m["pub"], msg_id, edit_id, status)
+            return None, None
         except Exception as e:
-            print(f"[parse_link] {e}")
+            logger.error(f"[parse_link] {e}")
             return None, None
 
     async def _handle_special_messages(self, msg, target_chat_id: int, topic_id: Optional[int], edit_id: int, sender: int) -> bool:
@@ -694,68 +1039,97 @@ class SmartTelegramBot:
                     await gf.delete_messages(msg.peer_id, [edit_id])
                     return True
         except Exception as e:
-            print(f"[direct_media] {e}")
+            logger.error(f"[direct_media] {e}")
             return False
         return False
 
-    async def _download_user_stories(self, userbot, chat_id: str, msg_id: int, sender: int, edit_id: int):
+    async def _set_status(self, status, sender: int, text: str):
+        """Show `text` to the user by editing `status`; send a new message only if that fails."""
+        if status is not None and await safe_edit(status, text):
+            return status
+        try:
+            return await gf.send_message(sender, text)
+        except Exception:
+            return status
+
+    async def _download_user_stories(self, userbot, chat_id: str, msg_id: int, sender: int, edit_id: int, status=None):
+        file_path = None
         try:
-            edit_msg = await gf.send_message(sender, "📖 Downloading Story...")
+            status = await self._set_status(status, sender, "📖 Downloading Story...")
             story = await userbot.get_stories(chat_id, msg_id)
             if not story or not getattr(story, 'media', None):
-                await gf.send_message(sender, "❌ No story available or no media.")
+                await self._set_status(status, sender, "❌ No story available or no media.")
                 return
             file_path = await userbot.download_media(story)
-            await gf.send_message(sender, "📤 Uploading Story...")
-            if getattr(story, 'media', None) == 'video':
-                await gf.send_file(sender, file_path)
-            elif getattr(story, 'media', None) == 'document':
+            status = await self._set_status(status, sender, "📤 Uploading Story...")
+            if story.media in ('video', 'document', 'photo'):
                 await gf.send_file(sender, file_path)
-            elif getattr(story, 'media', None) == 'photo':
-                await gf.send_file(sender, file_path)
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
-            await gf.send_message(sender, "✅ Story processed successfully.")
+            await self._set_status(status, sender, "✅ Story processed successfully.")
         except RPCError as e:
-            await gf.send_message(sender, f"❌ Error: {e}")
+            await self._set_status(status, sender, f"❌ Error: {e}")
+        finally:
+            await _safe_unlink(file_path)
+
+    async def _cached_get_messages(self, client, chat_id, message_id: int):
+        key = (id(client), chat_id, message_id)
+        msg = self._msg_cache.get(key)
+        if msg is None:
+            msg = await client.get_messages(chat_id, ids=message_id)
+            if msg:
+                self._msg_cache[key] = msg
+        return msg
+
+    async def _copy_to_log(self, client, sent, fallback, caption: Optional[str] = None):
+        """
+        Mirror a delivered message into LOG_GROUP by server-side forward;
+        `fallback` (media or text) is sent only if forwarding is refused.
+        """
+        if sent:
+            try:
+                await client.forward_messages(LOG_GROUP, sent)
+                return
+            except Exception:
+                pass
+        try:
+            if isinstance(fallback, str):
+                await client.send_message(LOG_GROUP, fallback)
+            else:
+                await client.send_file(LOG_GROUP, fallback, caption=caption)
+        except Exception:
+            pass
 
-    async def _copy_public_message(self, app_client, userbot, sender: int, chat_id: str, message_id: int, edit_id: int):
-        target_chat_str = self.user_chat_ids.get(sender, str(sender))
-        target_chat_id, topic_id = self.parse_target_chat(target_chat_str)
+    async def _copy_public_message(self, app_client, userbot, sender: int, chat_id: str, message_id: int, edit_id: int, status=None):
+        target_chat_id, topic_id = self.parse_target_chat(self.target_chat(sender))
         file_path = None
         try:
             # try to get message via app_client (gf)
-            msg = await app_client.get_messages(chat_id, ids=message_id)
-            custom_caption = self.user_caption_prefs.get(str(sender), "")
-            final_caption = await self._format_caption_with_custom(getattr(msg, 'message', '') or '', sender, custom_caption)
-
-            if getattr(msg, 'media', None) and not getattr(msg, 'document', None) and not getattr(msg, 'video', None):
-                if getattr(msg, 'photo', None):
-                    res = await app_client.send_file(target_chat_id, msg.photo, caption=final_caption, reply_to=topic_id)
-                elif getattr(msg, 'video', None):
-                    res = await app_client.send_file(target_chat_id, msg.video, caption=final_caption, reply_to=topic_id)
-                elif getattr(msg, 'document', None):
-                    res = await app_client.send_file(target_chat_id, msg.document, caption=final_caption, reply_to=topic_id)
-                try:
-                    await app_client.send_file(LOG_GROUP, file_path or msg.media, caption=final_caption)
-                except:
-                    pass
+            msg = await self._cached_get_messages(app_client, chat_id, message_id)
+            st = self._user_state.get(sender)
+            custom_caption = st.caption if st else ""
+            # msg may be None, so read its fields once here
+            media = getattr(msg, 'media', None)
+            text = getattr(msg, 'message', None) or ''
+            final_caption = await self._format_caption_with_custom(text, sender, custom_caption)
+
+            if media and not getattr(msg, 'document', None) and not getattr(msg, 'video', None):
+                photo = msg.photo
+                res = None
+                if photo:
+                    res = await app_client.send_file(target_chat_id, photo, caption=final_caption, reply_to=topic_id)
+                await self._copy_to_log(app_client, res, media, caption=final_caption)
                 try:
                     await gf.delete_messages(sender, [edit_id])
                 except:
                     pass
                 return
 
-            if getattr(msg, 'message', None):
+            if text:
                 try:
-                    await app_client.forward_messages(target_chat_id, msg, from_peer=chat_id)
+                    res = await app_client.forward_messages(target_chat_id, msg, from_peer=chat_id)
                 except:
                     # fallback to send message text
-                    await app_client.send_message(target_chat_id, msg.message)
-                try:
-                    await app_client.send_message(LOG_GROUP, msg.message)
-                except:
-                    pass
+                    res = await app_client.send_message(target_chat_id, text)
+                await self._copy_to_log(app_client, res, text)
                 try:
                     await gf.delete_messages(sender, [edit_id])
                 except:
@@ -763,23 +1137,17 @@ class SmartTelegramBot:
                 return
 
             # if direct copy failed, use userbot (already userbot is Telethon)
-            edit_msg = await gf.send_message(sender, "🔄 Trying alternative method...")
-            try:
-                await userbot(  # try join chat if required
-                    # userbot.join_chat equivalent; Telethon usage might differ
-                    # this is best-effort; in most cases public chat need not be joined
-                    lambda: None
-                )
-            except:
-                pass
+            edit_msg = await self._set_status(status, sender, "🔄 Trying alternative method...")
 
-            msg = await userbot.get_messages(chat_id, ids=message_id)
+            if userbot is not app_client or not msg:
+                msg = await self._cached_get_messages(userbot, chat_id, message_id)
             if not msg or getattr(msg, 'service', False) or getattr(msg, 'empty', False):
-                await edit_msg.edit("❌ Message not found or inaccessible")
+                await self._set_status(edit_msg, sender, "❌ Message not found or inaccessible")
                 return
 
-            if getattr(msg, 'message', None):
-                await app_client.send_message(target_chat_id, msg.message)
+            text = msg.message or ''
+            if text:
+                await app_client.send_message(target_chat_id, text)
                 try:
                     await edit_msg.delete()
                 except:
@@ -787,17 +1155,38 @@ class SmartTelegramBot:
                 return
 
             # download and re-upload
-            final_caption = await self._format_caption_with_custom(getattr(msg, 'message', '') if getattr(msg, 'message', None) else "", sender, custom_caption)
-            file_path = await userbot.download_media(msg)
-            file_path = await self.file_ops.process_filename(file_path, sender)
+            final_caption = await self._format_caption_with_custom(text, sender, custom_caption)
             filename, file_size, media_type = self.media_processor.get_media_info(msg)
 
+            # plain documents need no local probing (metadata, thumbnail), so
+            # download and upload overlap instead of running back to back;
+            # media_type says "document" for videos too, so ask msg itself
+            if (media_type == "document" and msg.video is None and msg.audio is None
+                    and msg.voice is None and msg.gif is None
+                    and file_size and file_size <= self.config.SIZE_LIMIT
+                    and self.media_processor.get_file_type(filename) == "document"):
+                new_name = await self.file_ops.processed_name(filename, sender)
+                input_file = await tele_stream_copy(userbot, gf, msg, new_name, file_size)
+                html_caption = await self.caption_formatter.markdown_to_html_async(final_caption or "")
+                sent = await gf.send_file(target_chat_id, input_file, caption=html_caption, reply_to=topic_id, parse_mode='html', force_document=True)
+                try:
+                    await gf.send_file(LOG_GROUP, sent.media, caption=html_caption, parse_mode='html')
+                except:
+                    pass
+                try:
+                    await edit_msg.delete()
+                except:
+                    pass
+                return
+
+            file_path = _download_path(filename)
+            file_path = await tele_fast_download(userbot, msg, file_path)
+            file_path = await self.file_ops.process_filename(file_path, sender)
+
             if media_type == "photo":
                 await app_client.send_file(target_chat_id, file_path, caption=final_caption, reply_to=topic_id)
             elif file_size and file_size > self.config.SIZE_LIMIT:
-                free_check = 0
-                if 'chk_user' in globals():
-                    free_check = await chk_user(chat_id, sender)
+                free_check = await chk_user(chat_id, sender)
                 if free_check == 1 or not self.pro_client:
                     await edit_msg.delete()
                     await self.file_ops.split_large_file(file_path, app_client, sender, target_chat_id, final_caption, topic_id)
@@ -808,50 +1197,23 @@ class SmartTelegramBot:
             else:
                 await self.upload_with_telethon(file_path, sender, target_chat_id, final_caption, topic_id, edit_msg)
         except Exception as e:
-            print(f"[public_copy] {e}")
+            logger.error(f"[public_copy] {e}")
         finally:
-            if file_path and os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
+            await _discard_download(file_path)
 
     async def _format_caption_with_custom(self, original_caption: str, sender: int, custom_caption: str) -> str:
-        delete_words = set(self.db.get_user_data(sender, "delete_words", []))
-        replacements = self.db.get_user_data(sender, "replacement_words", {})
-        processed = original_caption or ""
-        for word in delete_words:
-            processed = processed.replace(word, '  ')
-        for word, replace_word in replacements.items():
-            processed = processed.replace(word, replace_word)
+        if not original_caption:
+            return f"__**{custom_caption}**__" if custom_caption else ""
+        processed = await self.db.apply_word_filters(sender, original_caption, delete_fill='  ')
         if custom_caption:
             return f"{processed}\n\n__**{custom_caption}**__" if processed else f"__**{custom_caption}**__"
         return processed
 
     async def send_settings_panel(self, chat_id: int, user_id: int):
-        buttons = [
-            [Button.inline("Set Chat ID", b'setchat'), Button.inline("Set Rename Tag", b'setrename')],
-            [Button.inline("Caption", b'setcaption'), Button.inline("Replace Words", b'setreplacement')],
-            [Button.inline("Remove Words", b'delete'), Button.inline("Reset All", b'reset')],
-            [Button.inline("Session Login", b'addsession'), Button.inline("Logout", b'logout')],
-            [Button.inline("Set Thumbnail", b'setthumb'), Button.inline("Remove Thumbnail", b'remthumb')],
-            [Button.inline("PDF Watermark", b'pdfwt'), Button.inline("Video Watermark", b'watermark')],
-            [Button.inline("Upload Method", b'uploadmethod')],
-            [Button.url("Report Issues", "https://t.me/rajputserver")]
-        ]
-        message = (
-            "🛠 **Advanced Settings Panel**\n\n"
-            "Customize your bot experience with these options:\n"
-            "• Configure upload methods\n"
-            "• Set custom captions and rename tags\n"
-            "• Manage word filters and replacements\n"
-            "• Handle thumbnails and watermarks\n\n"
-            "Select an option to get started!"
-        )
         try:
-            await gf.send_file(chat_id, file=self.config.SETTINGS_PIC, caption=message, buttons=buttons)
+            await gf.send_file(chat_id, file=self.config.SETTINGS_PIC, caption=_SETTINGS_MESSAGE, buttons=_SETTINGS_BUTTONS)
         except Exception:
-            await gf.send_message(chat_id, message)
+            await gf.send_message(chat_id, _SETTINGS_MESSAGE)
 
 # create global instance
 telegram_bot = SmartTelegramBot()
@@ -861,172 +1223,185 @@ telegram_bot = SmartTelegramBot()
 async def settings_command_handler(event):
     await telegram_bot.send_settings_panel(event.chat_id, event.sender_id)
 
-@gf.on(events.CallbackQuery)
-async def callback_query_handler(event):
+# 'OLD' 'NEW' replacement rule; negated classes keep matching linear-time
+_REPLACEMENT_RE = re.compile(r"'([^']+)' '([^']+)'")
+
+# callback data -> handler; filled by @_on_callback below
+_CALLBACK_HANDLERS: Dict[bytes, Any] = {}
+
+def _on_callback(*tokens: bytes):
+    def register(fn):
+        for token in tokens:
+            _CALLBACK_HANDLERS[token] = fn
+        return fn
+    return register
+
+# Buttons that only open an input session: data -> (session type, prompt)
+_SESSION_PROMPTS = {
+    b'addsession': ('addsession', "🔑 **Session Login**\n\nSend your Telethon session string:"),
+    b'setchat': ('setchat', "💬 **Set Target Chat**\n\nSend the chat ID where files should be sent:"),
+    b'setrename': ('setrename', "🏷 **Set Rename Tag**\n\nSend the tag to append to filenames:"),
+    b'setcaption': ('setcaption', "📝 **Set Custom Caption**\n\nSend the caption to add to all files:"),
+    b'setreplacement': ('setreplacement',
+        "🔄 **Word Replacement**\n\nSend replacement rules in format:\n"
+        "`'OLD_WORD' 'NEW_WORD'`\n\nExample: `'sample' 'example'`"),
+    b'delete': ('deleteword',
+        "🗑 **Delete Words**\n\n"
+        "Send words separated by spaces to remove them from captions/filenames:"),
+}
+
+@_on_callback(*_SESSION_PROMPTS)
+async def _cb_start_session(event):
+    session_type, prompt = _SESSION_PROMPTS[event.data]
+    telegram_bot.user_state(event.sender_id).session = session_type
+    await event.respond(prompt)
+
+@_on_callback(b'uploadmethod')
+async def _cb_upload_method(event):
+    current_method = await telegram_bot.db.get_user_data(event.sender_id, "upload_method", "SpyLib")
+    tele_check = " ✅" if current_method == "Telethon" or current_method == "SpyLib" else ""
+    buttons = [
+        [Button.inline(f"SpyLib v1 ⚡{tele_check}", b'telethon')]
+    ]
+    await event.edit(
+        "📤 **Choose Upload Method:**\n\n"
+        "**SpyLib v1 ⚡:** Advanced features (Telethon)\n",
+        buttons=buttons
+    )
+
+@_on_callback(b'telethon')
+async def _cb_telethon(event):
+    telegram_bot.db.queue_save(event.sender_id, "upload_method", "Telethon")
+    await event.edit("✅ Upload method set to **SpyLib v1 ⚡**\n\nThanks for helping test this advanced library!")
+
+@_on_callback(b'logout')
+async def _cb_logout(event):
+    removed = await odb.remove_session(event.sender_id) if hasattr(odb, 'remove_session') else None
+    message = "✅ Logged out successfully!" if removed else "❌ You are not logged in."
+    await event.respond(message)
+
+@_on_callback(b'setthumb')
+async def _cb_set_thumb(event):
+    telegram_bot.user_state(event.sender_id).pending_photo = True
+    await event.respond("🖼 **Set Thumbnail**\n\nSend a photo to use as thumbnail for videos:")
+
+@_on_callback(b'remthumb')
+async def _cb_remove_thumb(event):
+    try:
+        os.remove(_thumb_path(event.sender_id))
+        await event.respond('✅ Thumbnail removed successfully!')
+    except FileNotFoundError:
+        await event.respond("❌ No thumbnail found to remove.")
+
+@_on_callback(b'pdfwt')
+async def _cb_pdf_watermark(event):
+    await event.respond("🚧 **PDF Watermark**\n\nThis feature is under development...")
+
+@_on_callback(b'watermark')
+async def _cb_video_watermark(event):
+    await event.respond("🚧 **Video Watermark**\n\nThis feature is under development...")
+
+@_on_callback(b'reset')
+async def _cb_reset(event):
     user_id = event.sender_id
-    data = event.data
-    # Upload method selection
-    if data == b'uploadmethod':
-        current_method = telegram_bot.db.get_user_data(user_id, "upload_method", "SpyLib")
-        pyro_check = " ✅" if current_method == "Pyrogram" else ""
-        tele_check = " ✅" if current_method == "Telethon" or current_method == "SpyLib" else ""
-        buttons = [
-            [Button.inline(f"SpyLib v1 ⚡{tele_check}", b'telethon')]
-        ]
-        await event.edit(
-            "📤 **Choose Upload Method:**\n\n"
-            "**SpyLib v1 ⚡:** Advanced features (Telethon)\n",
-            buttons=buttons
-        )
-
-    elif data == b'telethon':
-        telegram_bot.db.save_user_data(user_id, "upload_method", "Telethon")
-        await event.edit("✅ Upload method set to **SpyLib v1 ⚡**\n\nThanks for helping test this advanced library!")
-
-    # Session management and other settings
-    elif data == b'logout':
-        removed = await odb.remove_session(user_id) if hasattr(odb, 'remove_session') else None
-        message = "✅ Logged out successfully!" if removed else "❌ You are not logged in."
-        await event.respond(message)
-
-    elif data == b'addsession':
-        telegram_bot.user_sessions[user_id] = 'addsession'
-        await event.respond("🔑 **Session Login**\n\nSend your Telethon session string:")
-
-    elif data == b'setchat':
-        telegram_bot.user_sessions[user_id] = 'setchat'
-        await event.respond("💬 **Set Target Chat**\n\nSend the chat ID where files should be sent:")
-
-    elif data == b'setrename':
-        telegram_bot.user_sessions[user_id] = 'setrename'
-        await event.respond("🏷 **Set Rename Tag**\n\nSend the tag to append to filenames:")
-
-    elif data == b'setcaption':
-        telegram_bot.user_sessions[user_id] = 'setcaption'
-        await event.respond("📝 **Set Custom Caption**\n\nSend the caption to add to all files:")
-
-    elif data == b'setreplacement':
-        telegram_bot.user_sessions[user_id] = 'setreplacement'
-        await event.respond(
-            "🔄 **Word Replacement**\n\nSend replacement rules in format:\n"
-            "`'OLD_WORD' 'NEW_WORD'`\n\nExample: `'sample' 'example'`"
-        )
-
-    elif data == b'delete':
-        telegram_bot.user_sessions[user_id] = 'deleteword'
-        await event.respond(
-            "🗑 **Delete Words**\n\n"
-            "Send words separated by spaces to remove them from captions/filenames:"
-        )
-
-    elif data == b'setthumb':
-        telegram_bot.pending_photos.add(user_id)
-        await event.respond("🖼 **Set Thumbnail**\n\nSend a photo to use as thumbnail for videos:")
-
-    elif data == b'remthumb':
-        thumb_path = f'{user_id}.jpg'
-        if os.path.exists(thumb_path):
-            os.remove(thumb_path)
-            await event.respond('✅ Thumbnail removed successfully!')
+    try:
+        success = await telegram_bot.db.reset_user_data(user_id)
+        st = telegram_bot._user_state.get(user_id)
+        if st:
+            st.chat_id, st.rename, st.caption = None, "", ""
+        try:
+            os.remove(_thumb_path(user_id))
+        except FileNotFoundError:
+            pass
+        if success:
+            await event.respond("✅ All settings reset successfully!\n\nUse /logout to remove session.")
         else:
-            await event.respond("❌ No thumbnail found to remove.")
-
-    elif data == b'pdfwt':
-        await event.respond("🚧 **PDF Watermark**\n\nThis feature is under development...")
+            await event.respond("❌ Error occurred while resetting settings.")
+    except Exception as e:
+        await event.respond(f"❌ Reset failed: {e}")
 
-    elif data == b'watermark':
-        await event.respond("🚧 **Video Watermark**\n\nThis feature is under development...")
-
-    elif data == b'reset':
-        try:
-            success = telegram_bot.db.reset_user_data(user_id)
-            telegram_bot.user_chat_ids.pop(user_id, None)
-            telegram_bot.user_rename_prefs.pop(str(user_id), None)
-            telegram_bot.user_caption_prefs.pop(str(user_id), None)
-            thumb_path = f"{user_id}.jpg"
-            if os.path.exists(thumb_path):
-                os.remove(thumb_path)
-            if success:
-                await event.respond("✅ All settings reset successfully!\n\nUse /logout to remove session.")
-            else:
-                await event.respond("❌ Error occurred while resetting settings.")
-        except Exception as e:
-            await event.respond(f"❌ Reset failed: {e}")
+@gf.on(events.CallbackQuery)
+async def callback_query_handler(event):
+    handler = _CALLBACK_HANDLERS.get(event.data)
+    if handler:
+        await handler(event)
 
-@gf.on(events.NewMessage(func=lambda e: e.sender_id in telegram_bot.pending_photos))
+@gf.on(events.NewMessage(func=lambda e: telegram_bot.awaiting_photo(e.sender_id)))
 async def thumbnail_handler(event):
     user_id = event.sender_id
     if event.photo:
         temp_path = await event.download_media()
-        thumb_path = f'{user_id}.jpg'
-        if os.path.exists(thumb_path):
-            os.remove(thumb_path)
-        os.rename(temp_path, f'./{user_id}.jpg')
+        # atomic, and overwrites any previous thumbnail
+        os.replace(temp_path, _thumb_path(user_id))
         await event.respond('✅ Thumbnail saved successfully!')
     else:
         await event.respond('❌ Please send a photo. Try again.')
-    telegram_bot.pending_photos.discard(user_id)
+    telegram_bot.user_state(user_id).pending_photo = False
 
-@gf.on(events.NewMessage)
+# the filter runs in Telethon's dispatcher, so messages from users with no
+# pending input never get a handler coroutine scheduled
+@gf.on(events.NewMessage(func=lambda e: telegram_bot.session_of(e.sender_id) is not None))
 async def user_input_handler(event):
     user_id = event.sender_id
-    if user_id in telegram_bot.user_sessions:
-        session_type = telegram_bot.user_sessions[user_id]
-        if session_type == 'setchat':
-            try:
-                chat_id = int(event.raw_text.strip())
-                telegram_bot.user_chat_ids[user_id] = chat_id
-                telegram_bot.db.save_user_data(user_id, "target_chat_id", chat_id)
-                await event.respond(f"✅ Target chat set to: `{chat_id}`")
-            except Exception:
-                await event.respond("❌ Invalid chat ID format!")
-        elif session_type == 'setrename':
-            rename_tag = event.raw_text.strip()
-            telegram_bot.user_rename_prefs[str(user_id)] = rename_tag
-            telegram_bot.db.save_user_data(user_id, "rename_tag", rename_tag)
-            await event.respond(f"✅ Rename tag set to: **{rename_tag}**")
-        elif session_type == 'setcaption':
-            custom_caption = event.raw_text.strip()
-            telegram_bot.user_caption_prefs[str(user_id)] = custom_caption
-            telegram_bot.db.save_user_data(user_id, "custom_caption", custom_caption)
-            await event.respond(f"✅ Custom caption set to:\n\n**{custom_caption}**")
-        elif session_type == 'setreplacement':
-            match = re.match(r"'(.+)' '(.+)'", event.raw_text)
-            if not match:
-                await event.respond("❌ **Invalid format!**\n\nUse: `'OLD_WORD' 'NEW_WORD'`")
-            else:
-                old_word, new_word = match.groups()
-                delete_words = set(telegram_bot.db.get_user_data(user_id, "delete_words", []))
-                if old_word in delete_words:
-                    await event.respond(f"❌ '{old_word}' is in delete list and cannot be replaced.")
-                else:
-                    replacements = telegram_bot.db.get_user_data(user_id, "replacement_words", {})
-                    replacements[old_word] = new_word
-                    telegram_bot.db.save_user_data(user_id, "replacement_words", replacements)
-                    await event.respond(f"✅ Replacement saved:\n**'{old_word}' → '{new_word}'**")
-        elif session_type == 'addsession':
-            session_string = event.raw_text.strip()
-            # store session via odb if available
-            if hasattr(odb, 'set_session'):
-                await odb.set_session(user_id, session_string)
+    st = telegram_bot.user_state(user_id)
+    session_type = st.session
+    if session_type is None:
+        return
+    if session_type == 'setchat':
+        try:
+            chat_id = int(event.raw_text.strip())
+            st.chat_id = chat_id
+            telegram_bot.db.queue_save(user_id, "target_chat_id", chat_id)
+            await event.respond(f"✅ Target chat set to: `{chat_id}`")
+        except Exception:
+            await event.respond("❌ Invalid chat ID format!")
+    elif session_type == 'setrename':
+        rename_tag = event.raw_text.strip()
+        st.rename = rename_tag
+        telegram_bot.db.queue_save(user_id, "rename_tag", rename_tag)
+        await event.respond(f"✅ Rename tag set to: **{rename_tag}**")
+    elif session_type == 'setcaption':
+        custom_caption = event.raw_text.strip()
+        st.caption = custom_caption
+        telegram_bot.db.queue_save(user_id, "custom_caption", custom_caption)
+        await event.respond(f"✅ Custom caption set to:\n\n**{custom_caption}**")
+    elif session_type == 'setreplacement':
+        match = _REPLACEMENT_RE.match(event.raw_text)
+        if not match:
+            await event.respond("❌ **Invalid format!**\n\nUse: `'OLD_WORD' 'NEW_WORD'`")
+        else:
+            old_word, new_word = match.groups()
+            delete_words = set(await telegram_bot.db.get_user_data(user_id, "delete_words", []))
+            if old_word in delete_words:
+                await event.respond(f"❌ '{old_word}' is in delete list and cannot be replaced.")
             else:
-                # store locally if odb not available
-                telegram_bot.db.save_user_data(user_id, "session_string", session_string)
-            await event.respond("✅ Session string added successfully!")
-        elif session_type == 'deleteword':
-            words_to_delete = event.message.text.split()
-            delete_words = set(telegram_bot.db.get_user_data(user_id, "delete_words", []))
-            delete_words.update(words_to_delete)
-            telegram_bot.db.save_user_data(user_id, "delete_words", list(delete_words))
-            await event.respond(f"✅ Words added to delete list:\n**{', '.join(words_to_delete)}**")
-        # Clear session
-        del telegram_bot.user_sessions[user_id]
+                replacements = await telegram_bot.db.get_user_data(user_id, "replacement_words", {})
+                replacements[old_word] = new_word
+                telegram_bot.db.queue_save(user_id, "replacement_words", replacements)
+                await event.respond(f"✅ Replacement saved:\n**'{old_word}' → '{new_word}'**")
+    elif session_type == 'addsession':
+        session_string = event.raw_text.strip()
+        # store session via odb if available
+        if hasattr(odb, 'set_session'):
+            await odb.set_session(user_id, session_string)
+        else:
+            # store locally if odb not available
+            telegram_bot.db.queue_save(user_id, "session_string", session_string)
+        await event.respond("✅ Session string added successfully!")
+    elif session_type == 'deleteword':
+        words_to_delete = event.message.text.split()
+        delete_words = set(await telegram_bot.db.get_user_data(user_id, "delete_words", []))
+        delete_words.update(words_to_delete)
+        telegram_bot.db.queue_save(user_id, "delete_words", list(delete_words))
+        await event.respond(f"✅ Words added to delete list:\n**{', '.join(words_to_delete)}**")
+    # Clear session
+    st.session = None
 
 # ----------------- Module-level get_msg wrapper -----------------
 async def get_msg(userbot, sender, edit_id, msg_link, i, message):
     await telegram_bot.handle_message_download(userbot, sender, edit_id, msg_link, i, message)
 
-print("✅ Smart Telegram Bot (Telethon-only) initialized successfully!")
-print(f"   • Database: {'✅' if telegram_bot.db else '❌'}")
-print(f"   • Pro Client (4GB): {'✅' if telegram_bot.pro_client else '❌'}")
-print(f"   • Userbot (gf): {'✅' if gf else '❌'}")
+logger.info("✅ Smart Telegram Bot (Telethon-only) initialized successfully!")
+logger.info(f"   • Database: {'✅' if telegram_bot.db else '❌'}")
+logger.info(f"   • Pro Client (4GB): {'✅' if telegram_bot.pro_client else '❌'}")
+logger.info(f"   • Userbot (gf): {'✅' if gf else '❌'}")
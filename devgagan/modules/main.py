@@ -91,12 +91,15 @@ async def single_link(_, message):
         return
 
     # Check freemium limits
-    if await chk_user(message, user_id) == 1 and FREEMIUM_LIMIT == 0 and user_id not in OWNER_ID and not await is_user_verified(user_id):
+    freecheck = chk_user_sync(user_id)
+    if freecheck is None:
+        freecheck = await chk_user(message, user_id)
+    if freecheck == 1 and FREEMIUM_LIMIT == 0 and user_id not in OWNER_ID and not await is_user_verified(user_id):
         await message.reply("Freemium service is currently not available. Upgrade to premium for access.")
         return
 
     # Check cooldown
-    can_proceed, response_message = await check_interval(user_id, await chk_user(message, user_id))
+    can_proceed, response_message = await check_interval(user_id, freecheck)
     if not can_proceed:
         await message.reply(response_message)
         return
@@ -184,7 +187,9 @@ async def batch_link(_, message):
         )
         return
 
-    freecheck = await chk_user(message, user_id)
+    freecheck = chk_user_sync(user_id)
+    if freecheck is None:
+        freecheck = await chk_user(message, user_id)
     if freecheck == 1 and FREEMIUM_LIMIT == 0 and user_id not in OWNER_ID and not await is_user_verified(user_id):
         await message.reply("Freemium service is currently not available. Upgrade to premium for access.")
         return
@@ -18,7 +18,7 @@ import datetime, time
 from devgagan import app
 import asyncio
 from config import OWNER_ID
-from devgagan.core.func import get_seconds
+from devgagan.core.func import get_seconds, invalidate_premium_cache
 from devgagan.core.mongo import plans_db  
 from pyrogram import filters 
 
@@ -33,6 +33,7 @@ async def remove_premium(client, message):
         
         if data and data.get("_id"):
             await plans_db.remove_premium(user_id)
+            invalidate_premium_cache()
             await message.reply_text("ᴜꜱᴇʀ ʀᴇᴍᴏᴠᴇᴅ ꜱᴜᴄᴄᴇꜱꜱꜰᴜʟʟʏ !")
             await client.send_message(
                 chat_id=user_id,
@@ -107,10 +108,11 @@ async def give_premium_cmd_handler(client, message):
         user_id = int(message.command[1])
         user = await client.get_users(user_id)
         time = message.command[2]+" "+message.command[3]
-        seconds = await get_seconds(time)
+        seconds = get_seconds(time)
         if seconds > 0:
             expiry_time = datetime.datetime.now() + datetime.timedelta(seconds=seconds)  
             await plans_db.add_premium(user_id, expiry_time)  
+            invalidate_premium_cache()
             data = await plans_db.check_premium(user_id)
             expiry = data.get("expire_date")   
             expiry_str_in_ist = expiry.astimezone(pytz.timezone("Asia/Kolkata")).strftime("%d-%m-%Y\n⏱️ ᴇxᴘɪʀʏ ᴛɪᴍᴇ : %I:%M:%S %p")         
@@ -145,6 +147,7 @@ async def transfer_premium(client, message):
             
             # Add premium for the new user with the same expiry date
             await plans_db.add_premium(new_user_id, expiry)
+            invalidate_premium_cache()
             
             # Convert expiry date to IST format for display
             expiry_str_in_ist = expiry.astimezone(pytz.timezone("Asia/Kolkata")).strftime(
@@ -196,6 +199,7 @@ async def premium_remover():
                 if expiry_date <= datetime.datetime.now():
                     name = user.first_name
                     await plans_db.remove_premium(user_id)
+                    invalidate_premium_cache()
                     await app.send_message(user_id, text=f"Hello {name}, your premium subscription has expired.")
                     print(f"{name}, your premium subscription has expired.")
                     removed_users.append(f"{name} ({user_id})")
@@ -221,6 +225,7 @@ async def premium_remover():
                     not_removed_users.append(f"{name} ({user_id})")
         except:
             await plans_db.remove_premium(user_id)
+            invalidate_premium_cache()
             print(f"Unknown users captured : {user_id} removed")
             removed_users.append(f"Unknown ({user_id})")
 
@@ -93,7 +93,9 @@ async def token_handler(client, message):
         return  
  
     param = message.command[1] if len(message.command) > 1 else None
-    freecheck = await chk_user(message, user_id)
+    freecheck = chk_user_sync(user_id)
+    if freecheck is None:
+        freecheck = await chk_user(message, user_id)
     if freecheck != 1:
         await message.reply("You are a premium user no need of token 😉")
         return
@@ -119,7 +121,9 @@ async def token_handler(client, message):
 async def smart_handler(client, message):
     user_id = message.chat.id
      
-    freecheck = await chk_user(message, user_id)
+    freecheck = chk_user_sync(user_id)
+    if freecheck is None:
+        freecheck = await chk_user(message, user_id)
     if freecheck != 1:
         await message.reply("You are a premium user no need of token 😉")
         return
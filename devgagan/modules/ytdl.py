@@ -28,7 +28,7 @@ from pyrogram import Client,filters
 from telethon import events
 from telethon.sync import TelegramClient
 from telethon.tl.types import DocumentAttributeVideo
-from devgagan.core.func import screenshot, video_metadata, progress_bar
+from devgagan.core.func import screenshot, video_metadata_async, progress_bar
 from telethon.tl.functions.messages import EditMessageRequest
 from devgagantools import fast_upload
 from concurrent.futures import ThreadPoolExecutor
@@ -356,7 +356,7 @@ async def process_video(client, event, url, cookies_env_var, check_duration_and_
          
         await asyncio.to_thread(download_video, url, ydl_opts)
         title = info_dict.get('title', 'Powered by unknown man')
-        k = video_metadata(download_path)      
+        k = await video_metadata_async(download_path)      
         W = k['width']
         H = k['height']
         D = k['duration']